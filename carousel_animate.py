@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Animated slide export for the carousel decks
+The gradient, static patterns and text of a slide render once; each frame
+only redraws the animated overlays (pulsing network nodes, signals running
+along circuit traces). A PNG frame sequence or an ffmpeg raw-video pipe (when
+ffmpeg is installed) takes one frame at a time; GIF/WebP/APNG go through
+Pillow's save_all, which holds every frame until the file is written
+"""
+
+from itertools import chain
+import argparse
+import importlib
+import os
+import shutil
+import subprocess
+import time
+
+from carousel_deck import RENDERERS, find_decks, load_deck
+from carousel_layout import parse_size
+
+# Pillow writers: extension -> (format, extra save options)
+PILLOW_FORMATS = {
+    '.gif': ('GIF', {'disposal': 1, 'optimize': False}),
+    '.webp': ('WEBP', {'lossless': False, 'quality': 85, 'method': 4}),
+    '.png': ('PNG', {}),  # APNG
+}
+
+# Written through ffmpeg when it is on PATH
+FFMPEG_FORMATS = {
+    '.mp4': ['-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-crf', '20'],
+    '.webm': ['-c:v', 'libvpx-vp9', '-pix_fmt', 'yuv420p', '-b:v', '0', '-crf', '32'],
+    '.mov': ['-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-crf', '18'],
+}
+
+# Layouts animated by default: the slides with network and circuit patterns
+DEFAULT_LAYOUTS = ('cover', 'solution')
+
+
+def write_frames_pillow(frames, path, fps):
+    """Write frames into an animated GIF, WebP or APNG (Pillow keeps them all in memory until it saves)"""
+    file_format, options = PILLOW_FORMATS[os.path.splitext(path)[1].lower()]
+    first = next(frames)
+    first.save(path, format=file_format, save_all=True, append_images=frames,
+               duration=round(1000 / fps), loop=0, **options)
+
+
+def write_frames_ffmpeg(frames, path, fps):
+    """Pipe raw RGB frames to ffmpeg, one frame in memory at a time"""
+    ffmpeg = shutil.which('ffmpeg')
+    if not ffmpeg:
+        raise RuntimeError(f"{path}: ffmpeg is not installed; use .gif, .webp, .png or a frame directory")
+    first = next(frames)
+    command = [
+        ffmpeg, '-y', '-loglevel', 'error',
+        '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f"{first.width}x{first.height}", '-r', str(fps), '-i', '-',
+        *FFMPEG_FORMATS[os.path.splitext(path)[1].lower()], path,
+    ]
+    process = subprocess.Popen(command, stdin=subprocess.PIPE)
+    try:
+        for frame in chain([first], frames):
+            process.stdin.write(frame.tobytes())
+    finally:
+        process.stdin.close()
+        if process.wait():
+            raise RuntimeError(f"{path}: ffmpeg exited with status {process.returncode}")
+
+
+def write_frames_directory(frames, path):
+    """Write frame_0000.png, frame_0001.png, ... into a directory"""
+    os.makedirs(path, exist_ok=True)
+    for index, frame in enumerate(frames):
+        frame.save(os.path.join(path, f"frame_{index:04d}.png"), compress_level=1)
+
+
+def write_animation(frames, path, fps=24):
+    """Send a frame iterator to the writer the path's extension selects"""
+    frames = iter(frames)
+    extension = os.path.splitext(path)[1].lower()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if extension in PILLOW_FORMATS:
+        write_frames_pillow(frames, path, fps)
+    elif extension in FFMPEG_FORMATS:
+        write_frames_ffmpeg(frames, path, fps)
+    elif not extension:
+        write_frames_directory(frames, path)
+    else:
+        raise ValueError(f"{path}: unsupported animation format {extension!r}")
+    return path
+
+
+def animate_deck(deck, output_dir=None, layouts=DEFAULT_LAYOUTS, extension='.gif', frames=48, fps=24,
+                 size=None, scale=1.0, log=print):
+    """Write one animation per deck slide whose layout is in `layouts`"""
+    module = importlib.import_module(RENDERERS[deck['renderer']])
+    if not hasattr(module, 'LAYER_BUILDERS'):
+        raise ValueError(f"{deck['name']}: the {deck['renderer']} renderer has no animated patterns")
+    output_dir = output_dir or os.path.join(deck['output_dir'], 'animated')
+    width, height = parse_size(size) if size else (module.WIDTH, module.HEIGHT)
+    size = (round(width * scale), round(height * scale))
+
+    written = []
+    for index, slide in enumerate(deck['slides'], 1):
+        layout = slide.get('layout')
+        if layout not in layouts:
+            continue
+        kwargs = {key: value for key, value in slide.items() if key not in ('file', 'layout', 'label')}
+        stem = os.path.splitext(slide.get('file', f"slide_{index:02d}_{layout}.png"))[0]
+        path = os.path.join(output_dir, stem + extension)
+
+        start = time.perf_counter()
+        layers = module.LAYER_BUILDERS[layout](**kwargs, size=size)
+        write_animation(module.animation_frames(layers, frames), path, fps)
+        written.append(path)
+        if log:
+            log(f"  {slide.get('label') or stem:<55} {frames} frames "
+                f"{(time.perf_counter() - start) * 1000:8.1f} ms → {path}")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export animated versions of deck slides")
+    parser.add_argument('specs', nargs='+', help="deck spec files or directories of specs")
+    parser.add_argument('-o', '--output-root', default=None,
+                        help="write to OUTPUT_ROOT/<deck name> instead of <output_dir>/animated")
+    parser.add_argument('--layouts', default=','.join(DEFAULT_LAYOUTS),
+                        help=f"comma-separated layouts to animate (default: {','.join(DEFAULT_LAYOUTS)})")
+    parser.add_argument('--format', default='gif',
+                        help="gif, webp, png (APNG), mp4/webm/mov (needs ffmpeg) or 'frames' for a PNG sequence")
+    parser.add_argument('--frames', type=int, default=48, help="frames per loop (default: 48)")
+    parser.add_argument('--fps', type=int, default=24, help="frames per second (default: 24)")
+    parser.add_argument('--size', default=None, help="output size name or WxH (default: the design size)")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="render frames at this fraction of the size, e.g. 0.5 for lighter GIFs")
+    args = parser.parse_args(argv)
+
+    extension = '' if args.format == 'frames' else '.' + args.format.lstrip('.').lower()
+    if extension and extension not in PILLOW_FORMATS and extension not in FFMPEG_FORMATS:
+        parser.error(f"unsupported --format {args.format!r}")
+    if extension in FFMPEG_FORMATS and not shutil.which('ffmpeg'):
+        parser.error(f"--format {args.format} needs ffmpeg on PATH; use gif, webp, png or frames")
+    start = time.perf_counter()
+    for path in find_decks(args.specs):
+        deck = load_deck(path)
+        output_dir = os.path.join(args.output_root, deck['name']) if args.output_root else None
+        try:
+            animate_deck(deck, output_dir, args.layouts.split(','), extension, args.frames, args.fps,
+                         args.size, args.scale)
+        except (ValueError, RuntimeError) as exc:
+            # RuntimeError: ffmpeg failed partway through an encode
+            print(f"  skipped: {exc}")
+    print(f"✓ Done in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Image asset manager for the carousel generators
+Each asset decodes once per process into a premultiplied mip chain; sprites
+are scaled from the nearest larger level and cached per target size, so
+repeat uses of the logo across a deck are a cached paste
+"""
+
+from PIL import Image, ImageDraw
+from functools import lru_cache
+import hashlib
+import os
+
+from carousel_glyphs import ATLAS, draw_text, text_bounds
+from carousel_regions import recorded, union
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Logo sources in order of preference; the site copy is the same artwork
+LOGO_PATHS = (
+    os.path.join(ROOT_DIR, "assets", "sagemind_logo_2.webp"),
+    os.path.join(ROOT_DIR, "site", "public", "logo.webp"),
+)
+
+# The circular emblem inside the logo artwork, as fractions of its width and height
+EMBLEM_BOX = (0.2305, 0.125, 0.7793, 0.6738)
+
+# Edge supersampling of the emblem's disc mask
+_MASK_SCALE = 4
+
+
+def resolve_asset(paths):
+    """First existing path of a preference list"""
+    for path in paths:
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"none of these assets exist: {', '.join(paths)}")
+
+
+@lru_cache(maxsize=None)
+def asset_digest(name='logo'):
+    """Content hash of an asset's source file, for render cache keys"""
+    with open(resolve_asset(ASSETS[name][0]), 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _emblem(path):
+    """The logo's round emblem cut out of its white backdrop with an anti-aliased disc"""
+    with Image.open(path) as stored:
+        art = stored.convert('RGB')
+    width, height = art.size
+    box = tuple(round(f * side) for f, side in zip(EMBLEM_BOX, (width, height, width, height)))
+    emblem = art.crop(box).convert('RGBA')
+    size = (emblem.width * _MASK_SCALE, emblem.height * _MASK_SCALE)
+    mask = Image.new('L', size, 0)
+    ImageDraw.Draw(mask).ellipse([(0, 0), (size[0] - 1, size[1] - 1)], fill=255)
+    emblem.putalpha(mask.reduce(_MASK_SCALE))
+    return emblem
+
+
+# name -> (source paths, loader returning straight RGBA)
+ASSETS = {
+    'logo': (LOGO_PATHS, _emblem),
+}
+
+
+class MipChain:
+    """Premultiplied RGBA levels of an image, each half the size of the last"""
+
+    def __init__(self, img, min_size=16):
+        level = img.convert('RGBa')
+        self.levels = [level]
+        while min(level.size) >= 2 * min_size:
+            level = level.reduce(2)
+            self.levels.append(level)
+
+    def scaled(self, size):
+        """Straight-alpha RGBA at size, resampled from the smallest level not below it"""
+        source = self.levels[0]
+        for level in self.levels:
+            if level.width >= size[0] and level.height >= size[1]:
+                source = level
+        if source.size != size:
+            # Resampling premultiplied pixels keeps transparent edges from bleeding dark fringes
+            source = source.resize(size, Image.Resampling.LANCZOS)
+        return source.convert('RGBA')
+
+
+@lru_cache(maxsize=None)
+def mip_chain(name):
+    """Decode an asset once per process"""
+    paths, loader = ASSETS[name]
+    return MipChain(loader(resolve_asset(paths)))
+
+
+@lru_cache(maxsize=256)
+def sprite(name, height):
+    """Asset scaled to a pixel height (aspect kept); shared, so treat it as read-only"""
+    base = mip_chain(name).levels[0]
+    width = max(1, round(base.width * height / base.height))
+    return mip_chain(name).scaled((width, height))
+
+
+def paste_sprite(img, tile, position):
+    """Composite a sprite onto an RGBA or RGB image at an integer position"""
+    position = (round(position[0]), round(position[1]))
+    if img.mode == 'RGBA':
+        img.alpha_composite(tile, position)
+    else:
+        img.paste(tile, position, tile)
+
+
+def logo_width(draw, text, font, mark_height):
+    """Width of a draw_logo lockup"""
+    return mark_height + mark_height // 4 + round(draw.textlength(text, font=font))
+
+
+def logo_bounds(position, text, font, mark_height, **_):
+    """Box of the pixels draw_logo can touch"""
+    x, y = position
+    top, bottom = ATLAS.bbox(font, text)[1::2]
+    mark = sprite('logo', mark_height)
+    left, upper = round(x), round(y + (top + bottom - mark_height) / 2)
+    return union((left, upper, left + mark.width, upper + mark.height),
+                 text_bounds((x + mark_height + mark_height // 4, y), text, font))
+
+
+@recorded(logo_bounds)
+def draw_logo(img, draw, position, text, font, color, mark_height):
+    """Logo mark followed by a wordmark; position is the wordmark's text origin row and the mark's left edge"""
+    x, y = position
+    top, bottom = ATLAS.bbox(font, text)[1::2]
+    paste_sprite(img, sprite('logo', mark_height), (x, y + (top + bottom - mark_height) / 2))
+    draw_text(img, (x + mark_height + mark_height // 4, y), text, color, font)
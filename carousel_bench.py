@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the carousel generators
+Microbenchmarks cover each rendering primitive at 1080 px and 4K, and
+macrobenchmarks render the full v1 and v2 decks. Every benchmark runs in a
+fresh child process so its memory peak is its own. Results can be saved as a
+JSON baseline and later runs checked against it offline:
+
+    python carousel_bench.py --save          # record benchmarks/baseline.json
+    python carousel_bench.py --check         # fail when anything regressed
+
+A benchmark that looks regressed is measured again in fresh processes and
+only reported when it stays over the threshold in every round
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+
+# Slowdown of the fastest run (or memory growth) over the baseline that counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+# Differences below these are timer and allocator noise, never regressions
+MIN_DELTA_MS = 1.0
+MIN_DELTA_MB = 1.0
+
+# Extra rounds a suspected regression is re-measured in before --check reports it
+CONFIRM_ROUNDS = 2
+
+# Resolutions the primitives are measured at
+BENCH_SIZES = {
+    '1080': (1080, 1080),
+    '4k': (3840, 2160),
+}
+
+# One registered benchmark: setup(size) returns the callable that gets timed
+Benchmark = namedtuple('Benchmark', 'name setup sizes repeat')
+
+# Median/min wall time in ms, the child's peak RSS and the Python heap peak in MB
+BenchResult = namedtuple('BenchResult', 'name ms min_ms rss_mb py_mb')
+
+BENCHMARKS = []
+
+
+def benchmark(name, sizes=tuple(BENCH_SIZES), repeat=7):
+    """Register setup(size) -> callable as a benchmark at each of `sizes`"""
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name, setup, sizes, repeat))
+        return setup
+    return register
+
+
+# --- Primitives -----------------------------------------------------------
+
+@benchmark('gradient')
+def bench_gradient(size):
+    import generate_carousel_v2 as v2
+    return lambda: v2.create_gradient_background(*size, v2.DARK_NAVY, v2.DARK_TEAL)
+
+
+def _pattern_bench(pattern):
+    def setup(size):
+        from PIL import Image
+        import generate_carousel_v2 as v2
+        add_pattern = getattr(v2, pattern)
+        base = Image.new('RGB', size, v2.DARK_NAVY)
+        return lambda: add_pattern(base, v2.BRIGHT_CYAN)
+    return setup
+
+
+for _pattern in ('add_circuit_pattern', 'add_geometric_shapes', 'add_neural_network_pattern'):
+    benchmark(_pattern)(_pattern_bench(_pattern))
+
+
+@benchmark('geometric_tiled')
+def bench_geometric_tiled(size):
+    import generate_carousel_v2 as v2
+    return lambda: v2.geometric_overlay(size, v2.BRIGHT_CYAN, tile=540)
+
+
+PARAGRAPH = (
+    "Your team spends more time finding ways around your software's limitations than actually "
+    "using it. Every new hire learns the workaround before the workflow, and every workaround "
+    "needs its own workaround when the vendor ships an update. "
+) * 8
+
+
+@benchmark('wrap_text')
+def bench_wrap_text(size):
+    from carousel_fonts import get_font
+    from carousel_text import text_width, wrap_text
+    scale = min(size) / 1080
+    font = get_font(round(38 * scale))
+
+    def run():
+        # Cold width cache: every word is measured again
+        text_width.cache_clear()
+        wrap_text(PARAGRAPH, font, 950 * scale)
+    return run
+
+
+@benchmark('glow_text')
+def bench_glow_text(size):
+    from PIL import Image
+    from carousel_effects import draw_glow_text, glow_sprite
+    from carousel_fonts import get_font
+    scale = min(size) / 1080
+    font = get_font(round(85 * scale), 'bold')
+    img = Image.new('RGBA', size, (2, 34, 46, 255))
+
+    def run():
+        glow_sprite.cache_clear()
+        draw_glow_text(img, (round(80 * scale), round(300 * scale)), "Template Solutions",
+                       font, (255, 255, 255), (8, 241, 199), radius=round(15 * scale))
+    return run
+
+
+@benchmark('text_runs')
+def bench_text_runs(size):
+    from PIL import Image
+    from carousel_fonts import get_font
+    from carousel_glyphs import draw_text
+    scale = min(size) / 1080
+    runs = [("SAGEMIND AI", get_font(round(28 * scale))), ("3", get_font(round(180 * scale))),
+            ("✓ Built for your exact workflow", get_font(round(36 * scale)))]
+    img = Image.new('RGBA', size, (2, 34, 46, 255))
+
+    def run():
+        # A ten-slide batch drawing the same footer, sign number and bullet on every slide
+        for _ in range(10):
+            for index, (text, font) in enumerate(runs):
+                draw_text(img, (round(80 * scale), round((300 + 200 * index) * scale)), text,
+                          (8, 241, 199), font)
+    return run
+
+
+@benchmark('sign_slide_v2')
+def bench_sign_slide(size):
+    import generate_carousel_v2 as v2
+    from carousel_text import fit_text
+
+    def run():
+        v2.LAYER_CACHE.clear()
+        v2.REGION_CACHE.clear()
+        fit_text.cache_clear()
+        v2.create_sign_slide_v2(
+            1, "You're Building Workarounds for Workarounds",
+            "Your team spends more time finding ways around your software's limitations than actually using it.",
+            style='light', size=size,
+        )
+    return run
+
+
+@benchmark('rerender_cta')
+def bench_rerender_cta(size):
+    import generate_carousel_v2 as v2
+    copy = dict(headline_lines=["Ready to Build", "Something Better?"],
+                body_lines=["Let's talk about software", "built for how you work."],
+                url_text="sagemindai.io", size=size)
+    v2.create_cta_slide_v2(**copy, tagline="Thanks for reading")
+    names = iter(range(10 ** 9))
+
+    def run():
+        # Personalizing the tagline repaints its rectangle over the last render
+        v2.create_cta_slide_v2(**copy, tagline=f"Thanks for reading, reader {next(names)}")
+    return run
+
+
+# --- Full decks -----------------------------------------------------------
+
+def _deck_bench(module_name, sizes=None):
+    def setup(_size):
+        import importlib
+        from carousel_deck import deck_jobs, load_deck
+        from carousel_render import render_slides
+        from carousel_text import fit_text
+        module = importlib.import_module(module_name)
+        output_dir = tempfile.mkdtemp(prefix='carousel-bench-')
+        jobs = deck_jobs(load_deck(module.DECK_SPEC), module.LAYOUTS, output_dir, sizes=sizes)
+
+        def run():
+            if hasattr(module, 'LAYER_CACHE'):
+                module.LAYER_CACHE.clear()
+            if hasattr(module, 'REGION_CACHE'):
+                module.REGION_CACHE.clear()
+            fit_text.cache_clear()
+            render_slides(jobs, workers=1, log=None)
+        return run
+    return setup
+
+
+benchmark('deck_v1', sizes=('1080',), repeat=3)(_deck_bench('generate_carousel'))
+benchmark('deck_v2', sizes=('1080',), repeat=3)(_deck_bench('generate_carousel_v2'))
+benchmark('deck_v2', sizes=('4k',), repeat=3)(_deck_bench('generate_carousel_v2', sizes=[BENCH_SIZES['4k']]))
+
+
+# --- Runner -----------------------------------------------------------------
+
+def _max_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+
+def _memory_only_caches():
+    """Keep this process's layer caches off disk: benchmarks measure rendering, never the disk tier"""
+    os.environ['CAROUSEL_CACHE_DIR'] = ''
+    for module in list(sys.modules.values()):
+        cache = getattr(module, 'LAYER_CACHE', None)
+        if cache is not None:
+            cache.cache_dir = None
+
+
+def _measure(index, size, repeat):
+    """Run BENCHMARKS[index] in a child process and return its BenchResult"""
+    name, setup, _sizes, default_repeat = BENCHMARKS[index]
+    repeat = repeat or default_repeat
+    _memory_only_caches()
+    run = setup(BENCH_SIZES[size])
+    run()  # warm up imports, fonts and lazily built tables
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) * 1000)
+    # The parent only imports this module, so the child's peak is the benchmark's own
+    peak_rss = _max_rss_mb()
+
+    tracemalloc.start()
+    run()
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return BenchResult(f"{name}[{size}]", statistics.median(times), min(times), peak_rss, py_peak / 2 ** 20)
+
+
+def run_benchmarks(selected=None, repeat=None, log=print):
+    """Run matching benchmarks, each in a fresh process; returns {name: BenchResult}"""
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+    results = {}
+    for index, bench in enumerate(BENCHMARKS):
+        for size in bench.sizes:
+            name = f"{bench.name}[{size}]"
+            if selected and not any(pattern in name for pattern in selected):
+                continue
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(_measure, index, size, repeat).result()
+            results[name] = result
+            if log:
+                log(_format_row(result))
+    return results
+
+
+def best_of(a, b):
+    """Two measurements of one benchmark merged, keeping the least disturbed figure of each"""
+    def low(x, y):
+        return y if x is None else x if y is None else min(x, y)
+    return BenchResult(a.name, min(a.ms, b.ms), min(a.min_ms, b.min_ms), low(a.rss_mb, b.rss_mb),
+                       min(a.py_mb, b.py_mb))
+
+
+def _format_row(result, baseline=None):
+    rss = f"{result.rss_mb:8.1f}" if result.rss_mb is not None else f"{'-':>8}"
+    row = f"  {result.name:<36} {result.ms:9.2f} {result.min_ms:9.2f} {rss} {result.py_mb:8.1f}"
+    if baseline:
+        row += f"  {(result.min_ms / baseline['min_ms'] - 1) * 100:+6.1f}%"
+    return row
+
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {
+        'machine': machine_info(),
+        'benchmarks': {name: result._asdict() for name, result in sorted(results.items())},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def check_regressions(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Benchmarks whose fastest run or memory peak grew more than threshold over the baseline"""
+    regressions = []
+    for name, result in sorted(results.items()):
+        base = baseline['benchmarks'].get(name)
+        if not base:
+            continue
+        # The fastest run is the least disturbed by other load on the machine
+        if result.min_ms > max(base['min_ms'] * (1 + threshold), base['min_ms'] + MIN_DELTA_MS):
+            regressions.append(f"{name}: {base['min_ms']:.2f} ms -> {result.min_ms:.2f} ms")
+        if result.rss_mb is not None and base.get('rss_mb') is not None \
+                and result.rss_mb > max(base['rss_mb'] * (1 + threshold), base['rss_mb'] + MIN_DELTA_MB):
+            regressions.append(f"{name}: peak {base['rss_mb']:.1f} MB -> {result.rss_mb:.1f} MB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the carousel rendering primitives and decks")
+    parser.add_argument('filters', nargs='*', help="only run benchmarks whose name contains one of these")
+    parser.add_argument('--repeat', type=int, default=None, help="timed runs per benchmark")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument('--save', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--check', action='store_true', help="exit 1 when a benchmark regressed")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"allowed slowdown before --check fails (default: {DEFAULT_THRESHOLD * 100:.0f}%%)")
+    parser.add_argument('--confirm', type=int, default=CONFIRM_ROUNDS,
+                        help=f"extra rounds a suspected regression is re-measured in (default: {CONFIRM_ROUNDS})")
+    parser.add_argument('--list', action='store_true', help="list benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for bench in BENCHMARKS:
+            for size in bench.sizes:
+                print(f"{bench.name}[{size}]")
+        return 0
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    elif args.check:
+        parser.error(f"no baseline at {args.baseline}; run with --save first")
+
+    print(f"  {'benchmark':<36} {'median ms':>9} {'min ms':>9} {'peak MB':>8} {'py MB':>8}")
+    results = run_benchmarks(args.filters, args.repeat, log=None)
+    for name, result in results.items():
+        print(_format_row(result, baseline and baseline['benchmarks'].get(name)))
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"✓ Baseline saved to {args.baseline}")
+
+    if args.check:
+        for _ in range(args.confirm):
+            # One slow round is usually other load on the machine: measure suspects again, keep the best
+            suspects = [name for name, result in results.items()
+                        if check_regressions({name: result}, baseline, args.threshold)]
+            if not suspects:
+                break
+            print(f"\n  re-measuring {len(suspects)} suspected regression(s)")
+            for name, result in run_benchmarks(suspects, args.repeat, log=None).items():
+                results[name] = best_of(results[name], result)
+                print(_format_row(results[name], baseline['benchmarks'].get(name)))
+        regressions = check_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\n✓ No regressions over {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
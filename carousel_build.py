@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Incremental slide builds for the carousel generators
+Every slide's inputs (builder, copy, style, size, fonts, renderer version and
+encoder preset) hash to a key. Encoded outputs live in a content-addressed
+store with a manifest, so a rebuild renders only slides whose key changed and
+identical slides across decks are rendered and stored once
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import threading
+
+from carousel_assets import ASSETS, asset_digest
+from carousel_encode import DEFAULT_PRESET, output_path
+from carousel_fonts import FONT_CHAINS, FontNotFoundError, font_digest
+from carousel_render import render_slides
+
+MANIFEST_VERSION = 1
+
+# Store location; set CAROUSEL_SLIDE_CACHE to "" to always render everything
+DEFAULT_STORE_DIR = os.environ.get("CAROUSEL_SLIDE_CACHE", ".carousel_cache/slides")
+
+# Outcome counts of one build: rendered fresh, copied from the store, already up to date
+BuildStats = namedtuple('BuildStats', 'rendered reused unchanged')
+
+
+def _renderer_version(builder):
+    module = sys.modules.get(builder.__module__)
+    return getattr(module, 'RENDER_VERSION', 0)
+
+
+@lru_cache(maxsize=None)
+def _font_digests():
+    """Digest per face; a face missing on this host cannot shape any output, so it keys as None"""
+    digests = {}
+    for face in sorted(FONT_CHAINS):
+        try:
+            digests[face] = font_digest(face)
+        except FontNotFoundError:
+            digests[face] = None
+    return digests
+
+
+def slide_key(job, encoding=DEFAULT_PRESET):
+    """Content key for everything that determines a job's encoded output"""
+    arguments = inspect.signature(job.builder).bind(*job.args, **job.kwargs)
+    arguments.apply_defaults()
+    source = os.path.splitext(os.path.basename(inspect.getfile(inspect.unwrap(job.builder))))[0]
+    inputs = {
+        'builder': f"{source}.{job.builder.__qualname__}",
+        'version': _renderer_version(job.builder),
+        'arguments': arguments.arguments,
+        'fonts': _font_digests(),
+        'assets': {name: asset_digest(name) for name in sorted(ASSETS)},
+        'encoding': encoding,
+    }
+    raw = json.dumps(inputs, sort_keys=True, default=repr).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+class SlideStore:
+    """Content-addressed store of encoded slides plus a key -> object manifest"""
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR):
+        self.store_dir = store_dir
+        self.manifest_path = os.path.join(store_dir, "manifest.json")
+        self.manifest = {'version': MANIFEST_VERSION, 'slides': {}, 'outputs': {}}
+        self._lock = threading.Lock()
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('version') == MANIFEST_VERSION:
+                self.manifest = stored
+
+    def _object_path(self, name):
+        return os.path.join(self.store_dir, "objects", name[:2], name)
+
+    def lookup(self, key):
+        """Stored object path for a slide key, or None when it must be rendered"""
+        name = self.manifest['slides'].get(key)
+        if name and os.path.exists(self._object_path(name)):
+            return self._object_path(name)
+        return None
+
+    def ingest(self, key, path):
+        """Move a freshly encoded file into the store under its content hash"""
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        name = digest + os.path.splitext(path)[1]
+        target = self._object_path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if os.path.exists(target):
+            os.remove(path)
+        else:
+            os.replace(path, target)
+        with self._lock:
+            self.manifest['slides'][key] = name
+        return target
+
+    def is_current(self, path, obj):
+        """True when path still holds the object the manifest last wrote there"""
+        record = self.manifest['outputs'].get(os.path.abspath(path))
+        if not record or record['object'] != os.path.basename(obj) or not os.path.exists(path):
+            return False
+        stat = os.stat(path)
+        return (stat.st_size, stat.st_mtime_ns) == (record['size'], record['mtime_ns'])
+
+    def materialize(self, obj, path):
+        """Copy a stored object to an output path atomically and record it"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(obj, tmp_path)
+        os.replace(tmp_path, path)
+        stat = os.stat(path)
+        with self._lock:
+            self.manifest['outputs'][os.path.abspath(path)] = {
+                'object': os.path.basename(obj), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+            }
+
+    def save(self):
+        """Write the manifest atomically; safe to call from several threads"""
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        # Renamed under the lock too, so an older snapshot never replaces a newer one
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.manifest_path)
+
+
+def build_slides(jobs, output_dir=None, workers=None, executor='process', encoding=None,
+                 store_dir=DEFAULT_STORE_DIR, force=False, log=print):
+    """Render only jobs whose key is not in the store, then bring outputs up to date"""
+    if not store_dir:
+        render_slides(jobs, output_dir, workers, executor, log, encoding)
+        return BuildStats(len(jobs), 0, 0)
+
+    store = SlideStore(store_dir)
+    targets = []  # (job, key, output path)
+    missing = {}  # key -> job rendered on behalf of every job sharing the key
+    for job in jobs:
+        preset = encoding or job.encoding or DEFAULT_PRESET
+        key = slide_key(job, preset)
+        path = output_path(os.path.join(output_dir, job.filename) if output_dir else job.filename, preset)
+        targets.append((job, key, path))
+        if (force or store.lookup(key) is None) and key not in missing:
+            staging = os.path.join(store_dir, "staging", key)
+            missing[key] = job._replace(filename=staging, encoding=preset)
+
+    if missing:
+        render_slides(list(missing.values()), None, workers, executor, log)
+        for key, job in missing.items():
+            store.ingest(key, output_path(job.filename, job.encoding))
+
+    rendered = reused = unchanged = 0
+    for job, key, path in targets:
+        obj = store.lookup(key)
+        if key in missing:
+            rendered += 1
+        elif store.is_current(path, obj):
+            unchanged += 1
+            continue
+        else:
+            reused += 1
+        store.materialize(obj, path)
+
+    store.save()
+    stats = BuildStats(rendered, reused, unchanged)
+    if log:
+        log(f"  {len(missing)} slide(s) rendered for {rendered} output(s), "
+            f"{reused} copied from the store, {unchanged} unchanged")
+    return stats
+
+
+def add_build_arguments(parser):
+    """Shared --force option for the generator scripts"""
+    parser.add_argument('--force', action='store_true',
+                        help="re-render every slide instead of reusing unchanged ones")
+    return parser
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Layer cache for the carousel generators
+Deterministic background/pattern layers are kept in an in-memory LRU tier
+and mirrored to lossless PNGs on disk so later runs only redraw text
+"""
+
+from PIL import Image
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+
+# Bump when a layer builder changes its output so stale disk entries are ignored
+LAYER_VERSION = 4
+
+# On-disk tier location; set CAROUSEL_CACHE_DIR to "" to keep the cache in memory only
+DEFAULT_CACHE_DIR = os.environ.get("CAROUSEL_CACHE_DIR", ".carousel_cache/layers")
+
+
+class LayerCache:
+    """Two-tier (memory LRU + disk PNG) cache of rendered layers"""
+
+    def __init__(self, max_items=32, cache_dir=DEFAULT_CACHE_DIR):
+        self.max_items = max_items
+        self.cache_dir = cache_dir or None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(name, *params):
+        """Stable digest of a layer name and its parameters"""
+        raw = repr((LAYER_VERSION, name, params)).encode("utf-8")
+        return f"{name}-{hashlib.sha1(raw).hexdigest()[:20]}"
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def _remember(self, key, img):
+        with self._lock:
+            self._items[key] = img
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def get(self, name, params, build):
+        """Return a copy of the cached layer, calling build() on a miss"""
+        key = self.key(name, *params)
+
+        with self._lock:
+            img = self._items.get(key)
+            if img is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return img.copy()
+
+        if self.cache_dir and os.path.exists(self._path(key)):
+            with Image.open(self._path(key)) as stored:
+                img = stored.copy()
+            self.disk_hits += 1
+        else:
+            img = build()
+            self.misses += 1
+            if self.cache_dir:
+                self._store(key, img)
+
+        self._remember(key, img)
+        return img.copy()
+
+    def _store(self, key, img):
+        """Write atomically so concurrent renders never read a partial file"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        img.save(tmp_path, format="PNG", compress_level=1)
+        os.replace(tmp_path, self._path(key))
+
+    def clear(self, disk=False):
+        """Drop the memory tier, and the disk tier too when disk=True"""
+        with self._lock:
+            self._items.clear()
+        if disk and self.cache_dir and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".png"):
+                    os.remove(os.path.join(self.cache_dir, name))
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Render carousel decks from JSON/YAML deck specifications
+One invocation renders any number of specs through a single worker pool,
+so interpreter start-up, Pillow imports, fonts and layer caches are paid once
+"""
+
+import argparse
+import importlib
+import inspect
+import json
+import os
+import time
+
+from carousel_build import add_build_arguments, build_slides
+from carousel_layout import parse_size, size_suffix
+from carousel_pdf import add_pdf_arguments, parse_bytes, render_pdf
+from carousel_render import SlideJob, add_render_arguments
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# Renderer name in a spec -> generator module exposing a LAYOUTS table
+RENDERERS = {
+    'v1': 'generate_carousel',
+    'v2': 'generate_carousel_v2',
+}
+
+SPEC_EXTENSIONS = ('.json', '.yaml', '.yml')
+
+# Slide keys that describe the job rather than the builder arguments
+_JOB_KEYS = ('file', 'layout', 'label')
+
+
+def load_deck(path):
+    """Load one deck spec from a .json, .yaml or .yml file"""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise RuntimeError(f"{path}: install PyYAML to read YAML deck specs")
+            deck = yaml.safe_load(f)
+        else:
+            deck = json.load(f)
+
+    if not isinstance(deck, dict) or not deck.get('slides'):
+        raise ValueError(f"{path}: a deck spec needs a non-empty 'slides' list")
+    deck.setdefault('name', os.path.splitext(os.path.basename(path))[0])
+    deck.setdefault('renderer', 'v2')
+    deck.setdefault('output_dir', deck['name'])
+    return deck
+
+
+def find_decks(paths):
+    """Expand files and directories into a sorted list of spec files"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.endswith(SPEC_EXTENSIONS)
+            )
+        else:
+            found.append(path)
+    return found
+
+
+def renderer_layouts(renderer):
+    """Look up the layout -> builder table for a renderer name"""
+    if renderer not in RENDERERS:
+        raise ValueError(f"unknown renderer {renderer!r} (expected one of {sorted(RENDERERS)})")
+    return importlib.import_module(RENDERERS[renderer]).LAYOUTS
+
+
+def renderer_text_layouts(renderer):
+    """Layout name -> design-unit text layout function a renderer shares across sizes (may be empty)"""
+    renderer_layouts(renderer)
+    return getattr(importlib.import_module(RENDERERS[renderer]), 'TEXT_LAYOUTS', {})
+
+
+def deck_jobs(deck, layouts=None, output_dir=None, sizes=None, supersample=None):
+    """Turn a loaded deck spec into render jobs, one per slide and output size
+
+    Size variants of a slide whose layout has a design-unit text layout get it
+    fitted once here and passed in, so every variant only rasterizes
+    """
+    layouts = layouts or renderer_layouts(deck['renderer'])
+    output_dir = output_dir or deck['output_dir']
+    sizes = sizes or deck.get('sizes')
+    supersample = supersample or deck.get('supersample', 1)
+    text_layouts = renderer_text_layouts(deck['renderer']) if sizes or supersample != 1 else {}
+    jobs = []
+
+    for index, slide in enumerate(deck['slides'], 1):
+        layout = slide.get('layout')
+        if layout not in layouts:
+            raise ValueError(f"{deck['name']}: slide {index} has unknown layout {layout!r}")
+        builder = layouts[layout]
+        filename = slide.get('file', f"slide_{index:02d}_{layout}.png")
+        label = slide.get('label') or f"{deck['name']}: {filename}"
+        kwargs = {key: value for key, value in slide.items() if key not in _JOB_KEYS}
+
+        if not sizes and supersample == 1:
+            jobs.append(SlideJob(os.path.join(output_dir, filename), builder, (), kwargs,
+                                 label=label, encoding=deck.get('format')))
+            continue
+
+        if 'size' not in inspect.signature(builder).parameters:
+            raise ValueError(f"{deck['name']}: the {deck['renderer']} renderer only renders its fixed size")
+        stem, ext = os.path.splitext(filename)
+        text_layout = text_layouts.get(layout)
+        if text_layout is not None:
+            kwargs['text_layout'] = text_layout(**kwargs)
+        for size in sizes or [None]:
+            variant = dict(kwargs, supersample=supersample)
+            suffix = ""
+            if size is not None:
+                variant['size'] = parse_size(size)
+                suffix = size_suffix(size)
+            jobs.append(SlideJob(
+                os.path.join(output_dir, f"{stem}{suffix}{ext}"), builder, (), variant,
+                label=f"{label} {suffix.lstrip('_')}".rstrip(), encoding=deck.get('format'),
+            ))
+
+    return jobs
+
+
+def write_caption(deck, output_dir=None):
+    """Save the deck's post caption next to its slides"""
+    if not deck.get('caption'):
+        return None
+    output_dir = output_dir or deck['output_dir']
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, 'caption.txt')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(deck['caption'].rstrip() + "\n")
+    return path
+
+
+def main(argv=None):
+    """Render every deck spec given on the command line"""
+    parser = argparse.ArgumentParser(description="Render carousel decks from spec files")
+    parser.add_argument('specs', nargs='+', help="deck spec files or directories of specs")
+    parser.add_argument('-o', '--output-root', default=None,
+                        help="write each deck to OUTPUT_ROOT/<deck name> instead of its output_dir")
+    parser.add_argument('--sizes', default=None,
+                        help="comma-separated output sizes, e.g. square,portrait,link or 1600x900")
+    parser.add_argument('--supersample', type=int, default=None,
+                        help="render at N x resolution and reduce once for anti-aliasing")
+    parser.add_argument('--memory-budget', type=parse_bytes, default=None,
+                        help="stream slides one at a time, aiming to stay within this much memory, e.g. 512M "
+                             "(large batches; always re-renders, bypassing the slide store; no --pdf)")
+    add_render_arguments(parser)
+    add_build_arguments(parser)
+    add_pdf_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.memory_budget:
+        pdf_options = [f"--{name.replace('_', '-')}"
+                       for name in ('pdf', 'pdf_compression', 'pdf_quality', 'max_pdf_size')
+                       if getattr(args, name) != parser.get_default(name)]
+        if pdf_options:
+            parser.error(f"--memory-budget streams loose images; it cannot be combined with {', '.join(pdf_options)}")
+
+    sizes = args.sizes.split(',') if args.sizes else None
+    if args.memory_budget:
+        # Imported here: the streaming pipeline builds on this module
+        from carousel_stream import describe, stream_decks
+        start = time.perf_counter()
+        stats = stream_decks(args.specs, args.output_root, sizes, args.supersample, args.format, args.workers or 1,
+                             'thread' if args.threads else 'process', args.memory_budget)
+        print(describe(stats, time.perf_counter() - start))
+        return
+
+    decks = [load_deck(path) for path in find_decks(args.specs)]
+    executor = 'thread' if args.threads else 'process'
+
+    if args.pdf:
+        start = time.perf_counter()
+        for deck in decks:
+            output_dir = os.path.join(args.output_root, deck['name']) if args.output_root else deck['output_dir']
+            write_caption(deck, output_dir)
+            # One document per output size; a PDF's pages should share a size
+            for size in sizes or deck.get('sizes') or [None]:
+                jobs = deck_jobs(deck, output_dir=output_dir, sizes=[size] if size else None,
+                                 supersample=args.supersample)
+                path = os.path.join(output_dir, f"{deck['name']}{size_suffix(size) if size else ''}.pdf")
+                print(f"Rendering {deck['name']} ({len(jobs)} pages) to {path}...")
+                render_pdf(jobs, path, workers=args.workers, executor=executor,
+                           compression=args.pdf_compression, quality=args.pdf_quality,
+                           max_size=args.max_pdf_size)
+        print(f"✓ Done in {time.perf_counter() - start:.2f}s")
+        return
+
+    jobs = []
+    for deck in decks:
+        output_dir = os.path.join(args.output_root, deck['name']) if args.output_root else None
+        jobs.extend(deck_jobs(deck, output_dir=output_dir, sizes=sizes, supersample=args.supersample))
+        write_caption(deck, output_dir)
+
+    print(f"Rendering {len(jobs)} slides from {len(decks)} deck(s)...")
+    start = time.perf_counter()
+    build_slides(jobs, workers=args.workers, executor=executor, encoding=args.format, force=args.force)
+    print(f"✓ Done in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Text effects for the carousel generators
+A glow is one blurred copy of the text mask composited under the text, and
+the blurred sprite is cached per (text, font, color, radius); the text mask
+itself comes from the glyph atlas shared with the plain text draws
+"""
+
+from PIL import Image, ImageFilter
+from functools import lru_cache
+
+from carousel_glyphs import ATLAS, draw_text
+from carousel_regions import recorded
+
+# Blur at 1/GLOW_DOWNSCALE resolution and upscale; soft glows hide the difference
+GLOW_DOWNSCALE = 2
+
+
+@lru_cache(maxsize=256)
+def glow_sprite(text, font, glow_color, radius, strength=1.0, downscale=GLOW_DOWNSCALE):
+    """Blurred, tinted RGBA sprite of text and the (dx, dy) offset to paste it at"""
+    run = ATLAS.run(font, text)
+    left, top = run.offset
+    pad = radius * 2
+    width, height = run.mask.width + 2 * pad, run.mask.height + 2 * pad
+
+    # Pad the atlas mask for the blur to spread into
+    mask = Image.new('L', (width, height), 0)
+    mask.paste(run.mask, (pad, pad))
+
+    # Blur (at reduced resolution when the radius allows it)
+    if downscale > 1 and radius >= 2 * downscale:
+        small = mask.resize((max(1, width // downscale), max(1, height // downscale)), Image.BILINEAR)
+        small = small.filter(ImageFilter.GaussianBlur(radius / downscale))
+        blurred = small.resize((width, height), Image.BILINEAR)
+    else:
+        blurred = mask.filter(ImageFilter.GaussianBlur(radius))
+
+    if strength != 1.0:
+        blurred = blurred.point(lambda v: min(255, int(v * strength)))
+
+    sprite = Image.new('RGBA', (width, height), (*glow_color[:3], 0))
+    sprite.putalpha(blurred)
+    return sprite, (left - pad, top - pad)
+
+
+def composite_at(img, sprite, x, y):
+    """alpha_composite sprite onto img in place, clipping at the image edges"""
+    left, top = max(0, x), max(0, y)
+    right, bottom = min(img.width, x + sprite.width), min(img.height, y + sprite.height)
+    if right <= left or bottom <= top:
+        return
+    if (left, top, right, bottom) != (x, y, x + sprite.width, y + sprite.height):
+        sprite = sprite.crop((left - x, top - y, right - x, bottom - y))
+    img.alpha_composite(sprite, dest=(left, top))
+
+
+def glow_bounds(position, text, font, radius=10, **_):
+    """Box of the pixels draw_glow_text can touch: the text plus the glow's blur margin"""
+    left, top, right, bottom = ATLAS.bbox(font, text)
+    x, y = position
+    pad = radius * 2
+    return x + left - pad, y + top - pad, x + right + pad, y + bottom + pad
+
+
+@recorded(glow_bounds)
+def draw_glow_text(img, position, text, font, color, glow_color, radius=10, strength=1.0):
+    """Draw text on an RGBA image over a single blurred glow"""
+    x, y = position
+    sprite, (dx, dy) = glow_sprite(text, font, tuple(glow_color), radius, strength)
+    composite_at(img, sprite, x + dx, y + dy)
+    draw_text(img, (x, y), text, color, font)
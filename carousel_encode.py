@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Output encoder stage for the carousel generators
+Named presets pick the file format and encoder options, and an AsyncWriter
+encodes on a background thread so the next slide renders while the last one
+is compressed and written
+"""
+
+from PIL import Image, features
+from collections import namedtuple
+import argparse
+import io
+import os
+import queue
+import threading
+import time
+
+from carousel_profile import stage
+
+# format: Pillow format name; palette: quantize to that many colors first
+EncodePreset = namedtuple('EncodePreset', 'format extension options palette')
+EncodePreset.__new__.__defaults__ = (None,)
+
+PRESETS = {
+    'png': EncodePreset('PNG', '.png', {'compress_level': 6}),
+    'png-fast': EncodePreset('PNG', '.png', {'compress_level': 1}),
+    'png-small': EncodePreset('PNG', '.png', {'optimize': True}),
+    # Flat v1 slides hold a few hundred colors, almost all anti-aliased text edges
+    'png-palette': EncodePreset('PNG', '.png', {'optimize': True}, palette=256),
+    'webp': EncodePreset('WEBP', '.webp', {'lossless': True, 'method': 4}),
+    'webp-lossy': EncodePreset('WEBP', '.webp', {'quality': 90, 'method': 6}),
+    'jpeg': EncodePreset('JPEG', '.jpg', {'quality': 95, 'optimize': True, 'progressive': True, 'subsampling': 0}),
+    'avif': EncodePreset('AVIF', '.avif', {'quality': 80, 'speed': 6}),
+}
+
+DEFAULT_PRESET = 'png'
+
+# Timing record for one encoded image
+EncodeResult = namedtuple('EncodeResult', 'preset path bytes seconds')
+
+_FEATURES = {'WEBP': 'webp', 'AVIF': 'avif', 'JPEG': 'jpg'}
+
+
+def preset_available(name):
+    """True when this Pillow build can write the preset's format"""
+    feature = _FEATURES.get(PRESETS[name].format)
+    return feature is None or bool(features.check(feature))
+
+
+def available_presets():
+    return [name for name in PRESETS if preset_available(name)]
+
+
+def get_preset(name):
+    if name not in PRESETS:
+        raise ValueError(f"unknown output format {name!r} (expected one of {sorted(PRESETS)})")
+    if not preset_available(name):
+        raise RuntimeError(f"this Pillow build cannot write {PRESETS[name].format} ({name!r})")
+    return PRESETS[name]
+
+
+def output_path(path, name=DEFAULT_PRESET):
+    """Swap a path's extension for the preset's"""
+    return os.path.splitext(path)[0] + get_preset(name).extension
+
+
+def _prepare(img, preset):
+    if preset.palette:
+        img = img.convert('RGB') if img.mode not in ('RGB', 'L') else img
+        return img.quantize(preset.palette, dither=Image.Dither.NONE)
+    if preset.format == 'JPEG' and img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+def encode(img, name=DEFAULT_PRESET, fp=None):
+    """Encode img with a preset into fp (or a new buffer), returning fp"""
+    preset = get_preset(name)
+    fp = fp if fp is not None else io.BytesIO()
+    _prepare(img, preset).save(fp, format=preset.format, **preset.options)
+    return fp
+
+
+def save_image(img, path, name=DEFAULT_PRESET):
+    """Encode and write atomically so readers never see a partial file"""
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with stage(f'encode {name}'), open(tmp_path, 'wb') as f:
+            encode(img, name, f)
+    except BaseException:
+        # A failed encode leaves no partial tmp file behind
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+    return EncodeResult(name, path, os.path.getsize(path), time.perf_counter() - start)
+
+
+class AsyncWriter:
+    """Background thread that encodes and writes images handed to submit()"""
+
+    def __init__(self, name=DEFAULT_PRESET, max_pending=2):
+        get_preset(name)
+        self.name = name
+        self.results = []
+        self._errors = []
+        # Bounded so a fast renderer cannot pile up full frames in memory
+        self._queue = queue.Queue(max_pending)
+        self._thread = threading.Thread(target=self._run, name='carousel-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            img, path, name = item
+            try:
+                self.results.append(save_image(img, path, name))
+            except Exception as exc:
+                self._errors.append(exc)
+
+    def submit(self, img, path, name=None):
+        """Queue img for writing to path; blocks only while max_pending images wait"""
+        if self._errors:
+            raise self._errors[0]
+        self._queue.put((img, path, name or self.name))
+
+    def close(self):
+        """Wait for pending writes and re-raise the first failure"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if self._errors:
+            raise self._errors[0]
+        return self.results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._queue.put(None)
+            self._thread.join()
+
+
+def benchmark(img, names=None, repeat=3):
+    """Best-of-`repeat` encode time and size for each preset"""
+    results = []
+    for name in names or available_presets():
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = encode(img, name).getvalue()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results.append(EncodeResult(name, None, len(data), best))
+    return results
+
+
+def main(argv=None):
+    """Report bytes and encode time per format for existing slides"""
+    parser = argparse.ArgumentParser(description="Benchmark output encoders on rendered slides")
+    parser.add_argument('images', nargs='+', help="slide images to re-encode")
+    parser.add_argument('--formats', default=None,
+                        help=f"comma-separated presets (default: all available of {', '.join(PRESETS)})")
+    parser.add_argument('--repeat', type=int, default=3, help="encodes per image; the fastest is kept")
+    args = parser.parse_args(argv)
+
+    names = args.formats.split(',') if args.formats else available_presets()
+    totals = {name: [0, 0.0] for name in names}
+    for path in args.images:
+        with Image.open(path) as stored:
+            img = stored.convert('RGB')
+        for result in benchmark(img, names, args.repeat):
+            totals[result.preset][0] += result.bytes
+            totals[result.preset][1] += result.seconds
+
+    print(f"{len(args.images)} image(s)")
+    print(f"  {'format':<12} {'total KB':>10} {'encode ms':>10} {'ms/image':>9}")
+    for name, (size, seconds) in totals.items():
+        print(f"  {name:<12} {size / 1024:10.1f} {seconds * 1000:10.1f} {seconds * 1000 / len(args.images):9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Process-wide font registry for the carousel generators
+Each (face, size) is loaded once, and every face resolves through an explicit
+fallback chain instead of silently dropping to Pillow's bitmap default
+"""
+
+from PIL import ImageFont
+from functools import lru_cache
+import hashlib
+import io
+import os
+import shutil
+import subprocess
+import threading
+
+# Drop-in location for fonts shipped with the repo (e.g. assets/fonts/regular.ttf)
+BUNDLED_FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "fonts")
+
+# Fallback chain per face: file paths, or "fc:<pattern>" for a fontconfig lookup
+# (used only when fontconfig has the requested family, not a substitute for it).
+# CAROUSEL_FONT / CAROUSEL_FONT_BOLD put an explicit file in front of the chain.
+FONT_CHAINS = {
+    'regular': [
+        os.environ.get("CAROUSEL_FONT", ""),
+        os.path.join(BUNDLED_FONT_DIR, "regular.ttf"),
+        "/System/Library/Fonts/Helvetica.ttc",
+        "fc:Helvetica",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/TTF/DejaVuSans.ttf",
+        "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    ],
+    'bold': [
+        os.environ.get("CAROUSEL_FONT_BOLD", ""),
+        os.path.join(BUNDLED_FONT_DIR, "bold.ttf"),
+        "/System/Library/Fonts/Helvetica.ttc",
+        "fc:Helvetica:bold",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf",
+    ],
+}
+
+# Environment variable that overrides each face
+FONT_ENV = {'regular': "CAROUSEL_FONT", 'bold': "CAROUSEL_FONT_BOLD"}
+
+# Collection index to use inside .ttc files (Helvetica.ttc: 0 regular, 1 bold)
+TTC_INDEX = {'regular': 0, 'bold': 1}
+
+_font_bytes = {}
+_font_bytes_lock = threading.Lock()
+
+
+class FontNotFoundError(RuntimeError):
+    """No candidate in a face's fallback chain could be loaded"""
+
+
+def _fontconfig_match(pattern):
+    """Ask fc-match for a file of the pattern's family, or None when fontconfig is
+    unavailable or would only substitute another family"""
+    if not shutil.which("fc-match"):
+        return None
+    try:
+        result = subprocess.run(
+            ["fc-match", "--format=%{family}\n%{file}", pattern],
+            capture_output=True, text=True, timeout=5, check=True,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    families, _, path = result.stdout.partition("\n")
+    wanted = pattern.split(":")[0].strip().lower()
+    if wanted not in (family.strip().lower() for family in families.split(",")):
+        return None
+    return path.strip() or None
+
+
+@lru_cache(maxsize=None)
+def resolve_font_path(face='regular'):
+    """Walk the face's fallback chain and return the first loadable file"""
+    if face not in FONT_CHAINS:
+        raise FontNotFoundError(f"unknown font face {face!r} (expected one of {sorted(FONT_CHAINS)})")
+
+    tried = []
+    for candidate in FONT_CHAINS[face]:
+        if not candidate:
+            continue
+        path = _fontconfig_match(candidate[3:]) if candidate.startswith("fc:") else candidate
+        tried.append(candidate if path is None else path)
+        if path and os.path.isfile(path):
+            return path
+
+    raise FontNotFoundError(
+        f"no font found for face {face!r}; tried: {', '.join(tried)}. "
+        f"Set {FONT_ENV[face]} or add assets/fonts/{face}.ttf."
+    )
+
+
+def _read_font(path):
+    """Read each font file from disk once per process"""
+    with _font_bytes_lock:
+        if path not in _font_bytes:
+            with open(path, "rb") as f:
+                _font_bytes[path] = f.read()
+        return _font_bytes[path]
+
+
+@lru_cache(maxsize=None)
+def get_font(size, face='regular'):
+    """Return the shared FreeType font for (face, size)"""
+    path = resolve_font_path(face)
+    index = TTC_INDEX.get(face, 0) if path.endswith(".ttc") else 0
+    return ImageFont.truetype(io.BytesIO(_read_font(path)), size, index=index)
+
+
+@lru_cache(maxsize=None)
+def font_digest(face='regular'):
+    """Content hash of the file a face resolves to, for render cache keys"""
+    return hashlib.sha1(_read_font(resolve_font_path(face))).hexdigest()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Glyph run atlas for the carousel generators
+Each (font, text run) is shaped and rasterized by FreeType once into an alpha
+mask kept in a byte-bounded LRU; drawing it again is a blit of the cached mask
+with the fill color. Runs are shaped whole, so kerning and ligatures land
+exactly where ImageDraw.text puts them
+"""
+
+from PIL import Image, ImageDraw, ImageFont
+from collections import OrderedDict, namedtuple
+import threading
+
+from carousel_regions import recorded
+
+# Memory for cached masks (one byte per pixel); least recently drawn runs go first
+ATLAS_BYTES = 64 * 2 ** 20
+
+# A rasterized run: L mask and the (left, top) of its box relative to the text origin
+GlyphRun = namedtuple('GlyphRun', 'mask offset')
+
+
+def rasterize_run(font, text):
+    """Shape and rasterize one line of text into a tight alpha mask"""
+    left, top, right, bottom = font.getbbox(text, mode='L')
+    mask = Image.new('L', (max(1, right - left), max(1, bottom - top)), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+    return GlyphRun(mask, (left, top))
+
+
+class GlyphAtlas:
+    """LRU of rasterized text runs bounded by mask bytes"""
+
+    def __init__(self, max_bytes=ATLAS_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._runs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def run(self, font, text):
+        """Cached GlyphRun of text in font, rasterizing it on a miss"""
+        key = (font, text)
+        with self._lock:
+            run = self._runs.get(key)
+            if run is not None:
+                self._runs.move_to_end(key)
+                self.hits += 1
+                return run
+            self.misses += 1
+
+        run = rasterize_run(font, text)
+        with self._lock:
+            if key not in self._runs:
+                self._runs[key] = run
+                self.bytes += run.mask.width * run.mask.height
+                while self.bytes > self.max_bytes and len(self._runs) > 1:
+                    _, old = self._runs.popitem(last=False)
+                    self.bytes -= old.mask.width * old.mask.height
+                    self.evictions += 1
+        return run
+
+    def bbox(self, font, text):
+        """(left, top, right, bottom) of text drawn at the origin, as ImageDraw.textbbox"""
+        run = self.run(font, text)
+        left, top = run.offset
+        return left, top, left + run.mask.width, top + run.mask.height
+
+    def clear(self):
+        with self._lock:
+            self._runs.clear()
+            self.bytes = 0
+
+
+# Process-wide atlas shared by both generators and the glow effect
+ATLAS = GlyphAtlas()
+
+
+def _direct(position, text, font):
+    """Whether a draw bypasses the atlas"""
+    x, y = position
+    return '\n' in text or not isinstance(font, ImageFont.FreeTypeFont) or x != int(x) or y != int(y)
+
+
+def text_bounds(position, text, font, **_):
+    """Box of the pixels draw_text can touch"""
+    if _direct(position, text, font):
+        left, top, right, bottom = ImageDraw.Draw(Image.new('L', (1, 1))).textbbox(position, text, font=font)
+        return left - 1, top - 1, right + 1, bottom + 1
+    left, top, right, bottom = ATLAS.bbox(font, text)
+    x, y = int(position[0]), int(position[1])
+    return x + left, y + top, x + right, y + bottom
+
+
+@recorded(text_bounds)
+def draw_text(img, position, text, fill, font):
+    """draw.text(position, text, fill=fill, font=font) through the atlas
+
+    Multi-line text, bitmap fonts and fractional positions (which FreeType
+    rasterizes at a subpixel offset) go straight to ImageDraw
+    """
+    if _direct(position, text, font):
+        ImageDraw.Draw(img).text(position, text, fill=fill, font=font)
+        return
+    if not text:
+        return
+    run = ATLAS.run(font, text)
+    img.paste(fill, (int(position[0]) + run.offset[0], int(position[1]) + run.offset[1]), run.mask)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Golden-image regression harness for the carousel generators
+Re-renders decks in memory and compares each slide with its committed golden.
+A full-resolution pixel digest (cached per golden file) clears byte-identical
+slides without decoding the golden; every other slide gets a per-pixel diff
+with a tolerance and a heatmap of where it drifted
+"""
+
+from PIL import Image, ImageChops, ImageOps
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+
+from carousel_deck import deck_jobs, find_decks, load_deck
+from carousel_encode import DEFAULT_PRESET, encode, output_path, save_image
+from carousel_render import default_workers
+
+# Bump when image_digest changes so cached golden digests are recomputed
+DIGEST_VERSION = 2
+
+# Per-channel difference (0-255) a pixel may have and still match
+DEFAULT_TOLERANCE = 2
+
+DIGEST_CACHE_PATH = os.environ.get("CAROUSEL_GOLDEN_CACHE", ".carousel_cache/golden.json")
+
+# status: 'match' (pixels identical), 'within' (diff within tolerance), 'drift', 'size' or 'missing'
+GoldenResult = namedtuple('GoldenResult', 'golden status changed max_delta hamming heatmap')
+GoldenResult.__new__.__defaults__ = (0, 0, None, None)
+
+
+def image_digest(img):
+    """Digest of every RGB pixel; equal digests mean identical images"""
+    return hashlib.sha1(repr(img.size).encode() + img.convert('RGB').tobytes()).hexdigest()
+
+
+def dhash(img, hash_size=8):
+    """64-bit difference hash, for reporting how far a drifted slide moved"""
+    gray = img.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.BOX)
+    pixels = gray.tobytes()
+    bits = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            bits = (bits << 1) | (left > pixels[row * (hash_size + 1) + col + 1])
+    return bits
+
+
+class DigestCache:
+    """Golden digests keyed by path, size and mtime so goldens decode only when they change"""
+
+    def __init__(self, path=DIGEST_CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def digest(self, golden_path):
+        stat = os.stat(golden_path)
+        stamp = [DIGEST_VERSION, stat.st_size, stat.st_mtime_ns]
+        key = os.path.abspath(golden_path)
+        entry = self.entries.get(key)
+        if entry and entry['stamp'] == stamp:
+            return entry['digest']
+        with Image.open(golden_path) as golden:
+            digest = image_digest(golden)
+        with self._lock:
+            self.entries[key] = {'stamp': stamp, 'digest': digest}
+            self.dirty = True
+        return digest
+
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def diff_images(rendered, golden, tolerance=DEFAULT_TOLERANCE):
+    """(pixels over tolerance, largest channel delta, per-pixel max-delta 'L' image)"""
+    diff = ImageChops.difference(rendered.convert('RGB'), golden.convert('RGB'))
+    r, g, b = diff.split()
+    delta = ImageChops.lighter(ImageChops.lighter(r, g), b)
+    histogram = delta.histogram()
+    changed = sum(histogram[tolerance + 1:])
+    max_delta = max((level for level, count in enumerate(histogram) if count), default=0)
+    return changed, max_delta, delta
+
+
+def heatmap(golden, delta, tolerance=DEFAULT_TOLERANCE):
+    """Dimmed grayscale golden with drifted pixels in red, brighter for larger deltas"""
+    base = ImageOps.grayscale(golden.convert('RGB')).point(lambda v: v // 3).convert('RGB')
+    strength = delta.point(lambda v: 0 if v <= tolerance else min(255, 64 + v * 4))
+    red = Image.new('RGB', golden.size, (255, 0, 0))
+    return Image.composite(red, base, strength)
+
+
+def as_written(img, encoding):
+    """What the encoder would store for img (palette and lossy presets change pixels)"""
+    if encoding in (None, DEFAULT_PRESET):
+        return img
+    with Image.open(encode(img, encoding)) as stored:
+        return stored.convert('RGB')
+
+
+def compare(rendered, golden_path, digests, tolerance=DEFAULT_TOLERANCE, max_changed=0, report_dir=None):
+    """Check one rendered slide against its golden file"""
+    if not os.path.exists(golden_path):
+        return GoldenResult(golden_path, 'missing')
+    if image_digest(rendered) == digests.digest(golden_path):
+        return GoldenResult(golden_path, 'match')
+
+    with Image.open(golden_path) as stored:
+        golden = stored.convert('RGB')
+    if golden.size != rendered.size:
+        return GoldenResult(golden_path, 'size')
+
+    changed, max_delta, delta = diff_images(rendered, golden, tolerance)
+    hamming = bin(dhash(rendered) ^ dhash(golden)).count('1')
+    if changed <= max_changed:
+        return GoldenResult(golden_path, 'within', changed, max_delta, hamming)
+
+    heatmap_path = None
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(golden_path))[0]
+        heatmap_path = os.path.join(report_dir, f"{stem}_heatmap.png")
+        heatmap(golden, delta, tolerance).save(heatmap_path)
+    return GoldenResult(golden_path, 'drift', changed, max_delta, hamming, heatmap_path)
+
+
+def _render(job):
+    """Build one slide in a worker and return it as it would be written"""
+    return as_written(job.builder(*job.args, **job.kwargs), job.encoding)
+
+
+def check_decks(decks, goldens_root=None, tolerance=DEFAULT_TOLERANCE, max_changed=0,
+                report_dir=None, update=False, workers=None, executor='process', log=print):
+    """Render every deck and compare (or, with update, overwrite) its goldens"""
+    jobs = []
+    for deck in decks:
+        golden_dir = os.path.join(goldens_root, deck['name']) if goldens_root else deck['output_dir']
+        jobs.extend(deck_jobs(deck, output_dir=golden_dir))
+
+    digests = DigestCache()
+    results = []
+    workers = min(workers or default_workers(), len(jobs))
+    pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    with pool_class(max_workers=workers) as pool:
+        for job, rendered in zip(jobs, pool.map(_render, jobs)):
+            golden_path = output_path(job.filename, job.encoding or DEFAULT_PRESET)
+            if update:
+                save_image(rendered, golden_path, job.encoding or DEFAULT_PRESET)
+                result = GoldenResult(golden_path, 'updated')
+            else:
+                result = compare(rendered, golden_path, digests, tolerance, max_changed, report_dir)
+            results.append(result)
+            if log and result.status not in ('match', 'updated'):
+                detail = ""
+                if result.status in ('within', 'drift'):
+                    detail = (f" {result.changed} px over tolerance, max delta {result.max_delta}, "
+                              f"dHash distance {result.hamming}")
+                if result.heatmap:
+                    detail += f" → {result.heatmap}"
+                log(f"  {result.status:<8} {result.golden}{detail}")
+
+    digests.save()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare freshly rendered decks with their golden slides")
+    parser.add_argument('specs', nargs='*', default=[os.path.join(os.path.dirname(os.path.abspath(__file__)), 'decks')],
+                        help="deck spec files or directories (default: decks/)")
+    parser.add_argument('--goldens', default=None,
+                        help="goldens under GOLDENS/<deck name> instead of each deck's output_dir")
+    parser.add_argument('--tolerance', type=int, default=DEFAULT_TOLERANCE,
+                        help=f"per-channel delta a pixel may drift (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument('--max-changed', type=int, default=0,
+                        help="pixels per slide allowed over the tolerance (default: 0)")
+    parser.add_argument('--report', default='golden_report', help="directory for drift heatmaps")
+    parser.add_argument('--update', action='store_true', help="overwrite the goldens with the current render")
+    parser.add_argument('--workers', type=int, default=None, help="parallel slide renders (default: one per core)")
+    parser.add_argument('--threads', action='store_true', help="use a thread pool instead of a process pool")
+    args = parser.parse_args(argv)
+
+    decks = [load_deck(path) for path in find_decks(args.specs)]
+    results = check_decks(decks, args.goldens, args.tolerance, args.max_changed, args.report,
+                          args.update, args.workers, 'thread' if args.threads else 'process')
+
+    if args.update:
+        print(f"✓ Updated {len(results)} golden slide(s)")
+        return 0
+    failed = [result for result in results if result.status in ('drift', 'size', 'missing')]
+    matched = sum(result.status == 'match' for result in results)
+    print(f"{len(results)} slide(s): {matched} digest match, "
+          f"{len(results) - matched - len(failed)} within tolerance, {len(failed)} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Gradient engine for the carousel generators
+Builds each ramp in one bulk Pillow operation instead of one draw call per scanline
+"""
+
+from PIL import Image, ImageChops
+import math
+
+
+def _normalize_stops(stops):
+    """Turn [color, ...] or [(position, color), ...] into sorted (position, color) pairs"""
+    if len(stops) < 2:
+        raise ValueError("a gradient needs at least two color stops")
+
+    if all(isinstance(stop[1], (tuple, list)) for stop in stops):
+        pairs = [(float(pos), tuple(color)) for pos, color in stops]
+    else:
+        last = len(stops) - 1
+        pairs = [(i / last, tuple(color)) for i, color in enumerate(stops)]
+
+    return sorted(pairs, key=lambda pair: pair[0])
+
+
+def _color_at(stops, i, steps):
+    """Interpolate the stop list at t = i / steps, truncating like the original per-line loop
+
+    The numerator is formed before dividing by steps, as in
+    int(a + (b - a) * i / height), so truncation lands on the same integers
+    """
+    if i <= stops[0][0] * steps:
+        return stops[0][1]
+    for (p1, c1), (p2, c2) in zip(stops, stops[1:]):
+        if i <= p2 * steps:
+            span = (p2 - p1) * steps
+            if not span:
+                return c2
+            return tuple(int(a + (b - a) * (i - p1 * steps) / span) for a, b in zip(c1, c2))
+    return stops[-1][1]
+
+
+def color_ramp(stops, steps):
+    """Return `steps` colors where entry i sits at t = i / steps"""
+    stops = _normalize_stops(stops)
+    return [_color_at(stops, i, steps) for i in range(steps)]
+
+
+def _colorize(param, stops):
+    """Map an 'L' parameter image (0 = first stop, 255 = last) through the stop colors"""
+    lut = color_ramp(stops, 255) + [_normalize_stops(stops)[-1][1]]
+    palette = [channel for color in lut for channel in color]
+    param.putpalette(palette)
+    return param.convert('RGB')
+
+
+def linear_gradient(size, stops, direction='vertical'):
+    """Create a linear gradient: 'vertical', 'horizontal' or 'diagonal'"""
+    width, height = size
+
+    if direction == 'vertical':
+        strip = Image.new('RGB', (1, height))
+        strip.putdata(color_ramp(stops, height))
+        return strip.resize((width, height), Image.NEAREST)
+
+    if direction == 'horizontal':
+        strip = Image.new('RGB', (width, 1))
+        strip.putdata(color_ramp(stops, width))
+        return strip.resize((width, height), Image.NEAREST)
+
+    if direction == 'diagonal':
+        # Top-left to bottom-right: average a horizontal and a vertical 0..255 ramp
+        ramp = Image.linear_gradient('L')
+        vertical = ramp.resize((width, height), Image.BILINEAR)
+        horizontal = ramp.rotate(90).resize((width, height), Image.BILINEAR)
+        param = ImageChops.add(vertical, horizontal, scale=2.0)
+        return _colorize(param, stops)
+
+    raise ValueError(f"unknown gradient direction: {direction!r}")
+
+
+def radial_gradient(size, stops, center=None, radius=None):
+    """Create a radial gradient with the first stop at the center"""
+    width, height = size
+    cx, cy = center if center else (width / 2, height / 2)
+    radius = radius or max(width, height) / 2
+
+    # Pillow's radial ramp is 256x256 with value distance * sqrt(2), saturating near
+    # distance 181; remap it so 255 lands at distance 128, which the resize puts on `radius`
+    # (the patch corners lie beyond it and stay at the outer value)
+    scale = radius / 128
+    outer = 128 * math.sqrt(2)
+    param = Image.radial_gradient('L').point([min(255, round(v * 255 / outer)) for v in range(256)]).resize(
+        (max(1, round(256 * scale)), max(1, round(256 * scale))), Image.BILINEAR
+    )
+
+    # Place it over a canvas that is already at the outer value
+    canvas = Image.new('L', (width, height), 255)
+    canvas.paste(param, (round(cx - param.width / 2), round(cy - param.height / 2)))
+    return _colorize(canvas, stops)
+
+
+def gradient(size, stops, kind='vertical', **kwargs):
+    """Dispatch to the linear or radial builder by name"""
+    if kind == 'radial':
+        return radial_gradient(size, stops, **kwargs)
+    return linear_gradient(size, stops, direction=kind)
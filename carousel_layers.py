@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Layer-stack compositor for the carousel generators
+Slides declare their layers (background, patterns, text, effects) and the
+stack flattens them into a single RGBA buffer, converting to RGB once at the end
+"""
+
+from PIL import Image, ImageDraw
+from collections import Counter
+import threading
+
+
+class FrameCounter:
+    """Counts full-frame image allocations so copy elimination can be verified"""
+
+    def __init__(self):
+        self.kinds = Counter()
+        self.pixels = 0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self):
+        return sum(self.kinds.values())
+
+    def add(self, kind, n=1, pixels=0):
+        with self._lock:
+            self.kinds[kind] += n
+            self.pixels += pixels
+
+    def reset(self):
+        with self._lock:
+            self.kinds.clear()
+            self.pixels = 0
+
+
+# Process-wide instrumentation counter
+FRAME_ALLOCATIONS = FrameCounter()
+
+
+def track(img, kind):
+    """Record a full-frame image produced elsewhere and return it"""
+    FRAME_ALLOCATIONS.add(kind, pixels=img.width * img.height)
+    return img
+
+
+def new_frame(mode, size, color=0, kind='new'):
+    """Image.new, counted"""
+    return track(Image.new(mode, size, color), kind)
+
+
+def convert_frame(img, mode, kind='convert'):
+    """img.convert(mode), counted; a no-op when the mode already matches"""
+    if img.mode == mode:
+        return img
+    return track(img.convert(mode), kind)
+
+
+class LayerStack:
+    """Ordered layers flattened once into a single RGBA buffer"""
+
+    def __init__(self, size):
+        self.size = size
+        self.layers = []
+        self._owned = False
+
+    def add(self, layer, dest=(0, 0), name=None, owned=False):
+        """Add an image (composited at dest) or a callable(img, draw) that draws into the buffer
+
+        owned=True hands a first full-size RGBA image over to the stack, which
+        then composites straight into it; other images are never modified
+        """
+        if not self.layers:
+            self._owned = owned
+        self.layers.append((name, layer, dest))
+        return self
+
+    def flatten(self, mode='RGB'):
+        """Composite every layer in order and return the result in `mode`"""
+        layers = list(self.layers)
+
+        # The first full-size image layer becomes the buffer: itself when owned, else a copy
+        if layers and isinstance(layers[0][1], Image.Image) and layers[0][1].size == self.size:
+            base = layers.pop(0)[1]
+            if base.mode == 'RGBA' and not self._owned:
+                buffer = track(base.copy(), 'stack')
+            else:
+                buffer = convert_frame(base, 'RGBA', kind='stack')
+        else:
+            buffer = new_frame('RGBA', self.size, (0, 0, 0, 0), kind='stack')
+
+        draw = None
+        for _name, layer, dest in layers:
+            if isinstance(layer, Image.Image):
+                buffer.alpha_composite(convert_frame(layer, 'RGBA'), dest=dest)
+            else:
+                draw = draw or ImageDraw.Draw(buffer)
+                layer(buffer, draw)
+
+        return convert_frame(buffer, mode, kind='flatten')
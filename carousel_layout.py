@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Resolution-independent layout for the carousel generators
+Slides are laid out in design units (a 1080x1080 slide) and a Canvas maps
+them onto any output size, optionally supersampled and reduced once for
+anti-aliasing
+"""
+
+import re
+
+# The coordinate space every slide layout is written in
+DESIGN_SIZE = (1080, 1080)
+
+# Named output sizes: LinkedIn square/portrait and link-share cards
+SIZES = {
+    'square': (1080, 1080),
+    'portrait': (1080, 1350),
+    'link': (1200, 627),
+}
+
+
+def parse_size(size):
+    """Accept a SIZES name, a 'WxH' string or a (w, h) pair"""
+    if isinstance(size, str):
+        if size in SIZES:
+            return SIZES[size]
+        match = re.fullmatch(r"(\d+)[xX](\d+)", size.strip())
+        if not match:
+            raise ValueError(f"unknown size {size!r} (use one of {sorted(SIZES)} or WxH)")
+        return int(match.group(1)), int(match.group(2))
+    width, height = size
+    return int(width), int(height)
+
+
+class Canvas:
+    """Maps design units onto an output size and supersampling factor"""
+
+    def __init__(self, size=DESIGN_SIZE, supersample=1, design=DESIGN_SIZE):
+        self.size = parse_size(size)
+        self.supersample = max(1, int(supersample))
+        self.width = self.size[0] * self.supersample
+        self.height = self.size[1] * self.supersample
+        self.sx = self.width / design[0]
+        self.sy = self.height / design[1]
+        # Uniform scale for glyphs, strokes and spacing so text is never distorted
+        self.s = min(self.sx, self.sy)
+
+    @property
+    def raster_size(self):
+        return self.width, self.height
+
+    def x(self, value):
+        """Horizontal design position -> raster px"""
+        return round(value * self.sx)
+
+    def y(self, value):
+        """Vertical design position -> raster px"""
+        return round(value * self.sy)
+
+    def px(self, value):
+        """Design length (font size, stroke, spacing) -> raster px, at least 1"""
+        return max(1, round(value * self.s))
+
+    def right(self, inset):
+        """Raster x of a position `inset` design units in from the right edge"""
+        return self.width - self.x(inset)
+
+    def units(self, pixels):
+        """Raster span -> design units (for wrap widths and fit boxes)"""
+        return pixels / self.s
+
+    def finish(self, img):
+        """Downsample a supersampled raster to the output size with one reduce"""
+        if self.supersample > 1:
+            return img.reduce(self.supersample)
+        return img
+
+
+def size_suffix(size):
+    """Filename suffix for a size variant, empty for the design size"""
+    size = parse_size(size)
+    return "" if size == DESIGN_SIZE else f"_{size[0]}x{size[1]}"
+
+
+def render_variants(builder, sizes, supersample=1, **kwargs):
+    """Render one slide at several sizes; returns {(w, h): image}"""
+    return {
+        parse_size(size): builder(size=size, supersample=supersample, **kwargs)
+        for size in sizes
+    }
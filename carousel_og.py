@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Build-time Open Graph cards for the Next.js site
+Discovers the pages under site/src/app, takes each page's hero heading and
+lead paragraph as its card copy, and renders the cards in parallel into
+site/public/og. Cards are content-keyed through the slide store, so a site
+build only re-renders pages whose copy or card design changed
+"""
+
+from collections import namedtuple
+import argparse
+import html
+import os
+import re
+import time
+
+from carousel_build import add_build_arguments, build_slides
+from carousel_render import SlideJob, add_render_arguments
+from generate_carousel_v2 import create_og_card_v2
+
+SITE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "site")
+APP_DIR = os.path.join(SITE_DIR, "src", "app")
+OUTPUT_DIR = os.path.join(SITE_DIR, "public", "og")
+
+# Domain printed on the cards
+SITE_HOST = "sagemindai.io"
+
+PAGE_FILES = ('page.tsx', 'page.jsx', 'page.ts', 'page.js')
+
+# path: URL path ('/' for the home page); name: card file stem
+Route = namedtuple('Route', 'path name source title_lines description')
+
+_METADATA_FIELD = r"""{field}\s*:\s*(["'`])(.*?)(?<!\\)\1"""
+_H1 = re.compile(r"<h1\b[^>]*>(.*?)</h1>", re.S)
+_PARAGRAPH = re.compile(r"<p\b[^>]*>(.*?)</p>", re.S)
+_BREAK = re.compile(r"<br\s*/?>")
+
+
+def _plain(jsx):
+    """Visible text of a JSX fragment: string expressions kept, tags dropped, entities decoded"""
+    text = re.sub(r"""\{\s*(["'`])(.*?)\1\s*\}""", r"\2", jsx)
+    text = re.sub(r"\{[^}]*\}", "", text)
+    text = re.sub(r"<[^>]+>", "", text)
+    text = " ".join(html.unescape(text).split())
+    # A tag closing right before punctuation leaves a stray space behind
+    return re.sub(r"\s+([.,!?;:])", r"\1", text)
+
+
+def _metadata(source, field):
+    match = re.search(r"export\s+const\s+metadata[^=]*=\s*\{(.*?)\n\};", source, re.S)
+    if not match:
+        return None
+    value = re.search(_METADATA_FIELD.format(field=field), match.group(1), re.S)
+    return value.group(2) if value else None
+
+
+def page_copy(source):
+    """(title lines, description) for a page: its <h1> split at <br />, then metadata or the lead <p>"""
+    heading = _H1.search(source)
+    title_lines = []
+    if heading:
+        title_lines = [line for line in (_plain(part) for part in _BREAK.split(heading.group(1))) if line]
+    description = _metadata(source, 'description')
+    if description is None:
+        paragraph = _PARAGRAPH.search(source, heading.end() if heading else 0)
+        description = _plain(paragraph.group(1)) if paragraph else ""
+    if not title_lines:
+        title_lines = [_metadata(source, 'title') or ""]
+    return title_lines, description
+
+
+def discover_routes(app_dir=APP_DIR):
+    """Every static page route under an app directory, home page first"""
+    routes = []
+    for root, dirs, files in os.walk(app_dir):
+        # API handlers, private folders and dynamic segments have no fixed card
+        dirs[:] = sorted(d for d in dirs if d != 'api' and not d.startswith(('_', '[')))
+        page = next((name for name in PAGE_FILES if name in files), None)
+        if page is None:
+            continue
+        # Route groups like (marketing) shape folders but not URLs
+        segments = [part for part in os.path.relpath(root, app_dir).split(os.sep)
+                    if part != '.' and not part.startswith('(')]
+        source_path = os.path.join(root, page)
+        with open(source_path, encoding='utf-8') as f:
+            title_lines, description = page_copy(f.read())
+        routes.append(Route('/' + '/'.join(segments), '-'.join(segments) or 'home', source_path,
+                            title_lines, description))
+    return routes
+
+
+def og_jobs(routes, output_dir=OUTPUT_DIR, host=SITE_HOST):
+    """One card job per route, written to <output_dir>/<name>.png"""
+    return [
+        SlideJob(os.path.join(output_dir, f"{route.name}.png"), create_og_card_v2, (),
+                 {'title_lines': route.title_lines, 'description': route.description,
+                  'url_text': host + (route.path if route.path != '/' else '')},
+                 label=f"og {route.path}")
+        for route in routes
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render Open Graph cards for every site page")
+    parser.add_argument('--app-dir', default=APP_DIR, help="Next.js app directory to scan for pages")
+    parser.add_argument('-o', '--output-dir', default=OUTPUT_DIR, help="where the cards are written")
+    parser.add_argument('--host', default=SITE_HOST, help=f"domain printed on the cards (default: {SITE_HOST})")
+    parser.add_argument('--list', action='store_true', help="print the discovered routes and copy, then exit")
+    add_build_arguments(add_render_arguments(parser))
+    args = parser.parse_args(argv)
+
+    routes = discover_routes(args.app_dir)
+    if args.list:
+        for route in routes:
+            print(f"{route.path:<12} {' / '.join(route.title_lines)} — {route.description}")
+        return
+
+    start = time.perf_counter()
+    print(f"Open Graph cards for {len(routes)} page(s) → {args.output_dir}")
+    build_slides(og_jobs(routes, args.output_dir, args.host), workers=args.workers,
+                 executor='thread' if args.threads else 'process', encoding=args.format, force=args.force)
+    print(f"✓ Done in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Pattern generators for the carousel backgrounds
+Every generator draws from its own seeded random.Random, so patterns are
+deterministic under threads. Element counts scale with the canvas area in
+design units, periodic patterns can render as one seamless tile pasted
+across the canvas, and network neighbor search uses a uniform grid
+"""
+
+from PIL import Image, ImageDraw
+from collections import defaultdict
+from functools import lru_cache
+import heapq
+import math
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Above this many edges, rasterize them in one NumPy pass instead of one draw.line each
+BATCH_EDGES_THRESHOLD = 512
+
+
+def _grid(points, cell):
+    """Bucket point indices by grid cell"""
+    cells = defaultdict(list)
+    for index, (x, y) in enumerate(points):
+        cells[(int(x // cell), int(y // cell))].append(index)
+    return cells
+
+
+def radius_neighbors(points, radius):
+    """Pairs (i, j), i < j, closer than radius, in ascending (i, j) order"""
+    if radius <= 0:
+        raise ValueError("radius must be positive")
+    cells = _grid(points, radius)
+    limit = radius * radius
+    pairs = []
+
+    for i, (x, y) in enumerate(points):
+        cx, cy = int(x // radius), int(y // radius)
+        found = []
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for j in cells.get((gx, gy), ()):
+                    if j > i:
+                        dx, dy = points[j][0] - x, points[j][1] - y
+                        if dx * dx + dy * dy < limit:
+                            found.append(j)
+        pairs.extend((i, j) for j in sorted(found))
+
+    return pairs
+
+
+def knn_neighbors(points, k, radius=None, extent=None):
+    """Pairs (i, j), i < j, linking each point to its k nearest (optionally within radius)"""
+    if len(points) < 2 or k < 1:
+        return []
+
+    if extent is None:
+        extent = (max(x for x, _ in points) + 1, max(y for _, y in points) + 1)
+    cell = max(1.0, math.sqrt(extent[0] * extent[1] / len(points)))
+    cells = _grid(points, cell)
+    max_ring = int(max(extent) // cell) + 1
+    limit = radius * radius if radius else math.inf
+    pairs = set()
+
+    for i, (x, y) in enumerate(points):
+        cx, cy = int(x // cell), int(y // cell)
+        best = []  # max-heap of (-distance², j)
+        for ring in range(max_ring + 1):
+            for gx in range(cx - ring, cx + ring + 1):
+                for gy in range(cy - ring, cy + ring + 1):
+                    if max(abs(gx - cx), abs(gy - cy)) != ring:
+                        continue
+                    for j in cells.get((gx, gy), ()):
+                        if j == i:
+                            continue
+                        dx, dy = points[j][0] - x, points[j][1] - y
+                        d2 = dx * dx + dy * dy
+                        if d2 >= limit:
+                            continue
+                        if len(best) < k:
+                            heapq.heappush(best, (-d2, j))
+                        elif d2 < -best[0][0]:
+                            heapq.heapreplace(best, (-d2, j))
+            # Anything in a later ring is at least ring * cell away
+            reach = (ring * cell) ** 2
+            if (len(best) == k and -best[0][0] <= reach) or reach >= limit:
+                break
+        pairs.update((min(i, j), max(i, j)) for _, j in best)
+
+    return sorted(pairs)
+
+
+def _raster_edges(size, points, edges, alpha):
+    """Rasterize 1px edges into an 'L' mask with one vectorized NumPy pass"""
+    width, height = size
+    p = np.asarray(points, dtype=np.float64)
+    e = np.asarray(edges, dtype=np.int64)
+    start, delta = p[e[:, 0]], p[e[:, 1]] - p[e[:, 0]]
+
+    steps = np.abs(delta).max(axis=1).astype(np.int64) + 1
+    owner = np.repeat(np.arange(len(e)), steps)
+    offset = np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)
+    t = offset / np.maximum(steps - 1, 1)[owner]
+    xy = np.rint(start[owner] + delta[owner] * t[:, None]).astype(np.int64)
+
+    inside = (xy[:, 0] >= 0) & (xy[:, 0] < width) & (xy[:, 1] >= 0) & (xy[:, 1] < height)
+    mask = np.zeros((height, width), dtype=np.uint8)
+    mask[xy[inside, 1], xy[inside, 0]] = alpha
+    return Image.fromarray(mask, 'L')
+
+
+def pattern_field(size, design_size=None):
+    """(design-unit extent of the canvas, uniform design -> raster scale)
+
+    The scale fits the design canvas onto `size` without stretching; wider or
+    taller canvases see more of the pattern field instead of distorted shapes
+    """
+    design_size = tuple(design_size or size)
+    scale = min(size[0] / design_size[0], size[1] / design_size[1])
+    return (round(size[0] / scale), round(size[1] / scale)), scale
+
+
+def area_count(count, field, design_size):
+    """Scale a per-design-canvas element count to a field's area (at least one)"""
+    return max(1, round(count * field[0] * field[1] / (design_size[0] * design_size[1])))
+
+
+def _wrap_periods(low, high, period):
+    """Whole periods k for which [low, high] shifted by k * period meets [0, period]"""
+    return range(math.ceil(-high / period), math.floor((period - low) / period) + 1)
+
+
+def _wrap_offsets(bounds, period):
+    """Offsets (in multiples of the tile) at which a shape's bounds show inside the tile
+
+    Every period the bounds span counts, so shapes reaching further than one
+    tile still wrap seamlessly
+    """
+    x0, y0, x1, y1 = bounds
+    return [(ox * period, oy * period)
+            for ox in _wrap_periods(x0, x1, period) for oy in _wrap_periods(y0, y1, period)]
+
+
+def tile_layer(size, tile):
+    """Repeat an RGBA tile across a transparent canvas of `size`"""
+    layer = Image.new('RGBA', size, (0, 0, 0, 0))
+    for y in range(0, size[1], tile.height):
+        for x in range(0, size[0], tile.width):
+            layer.paste(tile, (x, y))
+    return layer
+
+
+def _tiled(size, design_size, tile, draw_tile):
+    """Render draw_tile(tile_px, scale) once and repeat it; the tile period is exact in raster px"""
+    _, scale = pattern_field(size, design_size)
+    tile_px = max(1, round(tile * scale))
+    return tile_layer(size, draw_tile(tile_px, tile_px / tile))
+
+
+@lru_cache(maxsize=64)
+def circuit_traces(field, count, seed, reach=200):
+    """Design-unit (x1, y1, x2, y2) traces with one end inside the field"""
+    rng = random.Random(seed)
+    traces = []
+    for _ in range(count):
+        x1, y1 = rng.randint(0, field[0]), rng.randint(0, field[1])
+        x2, y2 = x1 + rng.randint(-reach, reach), y1 + rng.randint(-reach, reach)
+        traces.append((x1, y1, x2, y2))
+    return tuple(traces)
+
+
+def scaled_circuit_traces(size, seed, count=15, design_size=None):
+    """Circuit traces for a canvas, in raster px"""
+    field, scale = pattern_field(size, design_size)
+    traces = circuit_traces(field, area_count(count, field, design_size or size), seed)
+    return [(round(x1 * scale), round(y1 * scale), round(x2 * scale), round(y2 * scale))
+            for x1, y1, x2, y2 in traces]
+
+
+def _draw_traces(draw, traces, fill, width, r):
+    for x1, y1, x2, y2 in traces:
+        draw.line([(x1, y1), (x2, y2)], fill=fill, width=width)
+        draw.ellipse([(x1-r, y1-r), (x1+r, y1+r)], fill=fill)
+        draw.ellipse([(x2-r, y2-r), (x2+r, y2+r)], fill=fill)
+
+
+def circuit_layer(size, color, opacity=30, seed=42, count=15, design_size=None, tile=None):
+    """Circuit board traces with pads as a transparent RGBA layer
+
+    count is per design canvas; tile (design units) renders one seamless tile of that period and repeats it
+    """
+    design_size = tuple(design_size or size)
+    fill = (*color, opacity)
+
+    if tile:
+        def draw_tile(tile_px, scale):
+            img = Image.new('RGBA', (tile_px, tile_px), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(img)
+            pad = 5 * scale
+            for x1, y1, x2, y2 in circuit_traces((tile, tile), area_count(count, (tile, tile), design_size), seed):
+                bounds = (min(x1, x2) * scale - pad, min(y1, y2) * scale - pad,
+                          max(x1, x2) * scale + pad, max(y1, y2) * scale + pad)
+                for ox, oy in _wrap_offsets(bounds, tile_px):
+                    _draw_traces(draw, [(round(x1 * scale) + ox, round(y1 * scale) + oy,
+                                         round(x2 * scale) + ox, round(y2 * scale) + oy)],
+                                 fill, max(1, round(2 * scale)), pad)
+            return img
+        return _tiled(size, design_size, tile, draw_tile)
+
+    _, scale = pattern_field(size, design_size)
+    overlay = Image.new('RGBA', size, (0, 0, 0, 0))
+    _draw_traces(ImageDraw.Draw(overlay), scaled_circuit_traces(size, seed, count, design_size),
+                 fill, max(1, round(2 * scale)), 5 * scale)
+    return overlay
+
+
+@lru_cache(maxsize=64)
+def hexagons(field, count, seed, min_radius=40, max_radius=80):
+    """Design-unit (x, y, radius) hexagons centred inside the field"""
+    rng = random.Random(seed)
+    return tuple((rng.randint(0, field[0]), rng.randint(0, field[1]), rng.randint(min_radius, max_radius))
+                 for _ in range(count))
+
+
+def _hexagon_points(x, y, radius):
+    return [(x + radius * math.cos(math.pi / 3 * i), y + radius * math.sin(math.pi / 3 * i)) for i in range(6)]
+
+
+def geometric_layer(size, color, opacity=40, seed=123, count=8, design_size=None, tile=None):
+    """Hexagon outlines as a transparent RGBA layer (count per design canvas, optional seamless tile)"""
+    design_size = tuple(design_size or size)
+    outline = (*color, opacity)
+
+    if tile:
+        def draw_tile(tile_px, scale):
+            img = Image.new('RGBA', (tile_px, tile_px), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(img)
+            for x, y, radius in hexagons((tile, tile), area_count(count, (tile, tile), design_size), seed):
+                x, y, radius = x * scale, y * scale, radius * scale
+                for ox, oy in _wrap_offsets((x - radius, y - radius, x + radius, y + radius), tile_px):
+                    draw.polygon(_hexagon_points(x + ox, y + oy, radius), outline=outline,
+                                 width=max(1, round(2 * scale)))
+            return img
+        return _tiled(size, design_size, tile, draw_tile)
+
+    field, scale = pattern_field(size, design_size)
+    overlay = Image.new('RGBA', size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    for x, y, radius in hexagons(field, area_count(count, field, design_size), seed):
+        draw.polygon(_hexagon_points(x * scale, y * scale, radius * scale), outline=outline,
+                     width=max(1, round(2 * scale)))
+    return overlay
+
+
+def network_nodes(size, count, seed, margin=100):
+    """Deterministic node positions kept `margin` px away from the edges (less on fields narrower than 2 * margin)"""
+    width, height = size
+    margin_x, margin_y = min(margin, width // 2), min(margin, height // 2)
+    rng = random.Random(seed)
+    return [(rng.randint(margin_x, width - margin_x), rng.randint(margin_y, height - margin_y)) for _ in range(count)]
+
+
+@lru_cache(maxsize=64)
+def network_geometry(design_size, nodes, seed, margin=100, radius=250, mode='radius', k=3):
+    """(points, edges) of a network pattern; shared by stills and every animation frame"""
+    points = network_nodes(design_size, nodes, seed, margin)
+    if mode == 'knn':
+        edges = knn_neighbors(points, k, radius=radius, extent=design_size)
+    elif mode == 'radius':
+        edges = radius_neighbors(points, radius)
+    else:
+        raise ValueError(f"unknown neighbor mode {mode!r} (expected 'radius' or 'knn')")
+    return tuple(points), tuple(edges)
+
+
+def _scaled_network(size, design_size, nodes, seed, margin, radius, mode, k, node_radius):
+    """Network geometry over the canvas's design field, mapped onto `size`"""
+    field, scale = pattern_field(size, design_size)
+    points, edges = network_geometry(field, area_count(nodes, field, design_size or size), seed,
+                                     margin, radius, mode, k)
+    if scale != 1:
+        points = [(round(x * scale), round(y * scale)) for x, y in points]
+    return list(points), edges, max(1, round(node_radius * scale)), max(1, round(scale))
+
+
+def neural_network_layer(size, color, opacity=50, seed=789, nodes=12, radius=250,
+                         mode='radius', k=3, margin=100, node_radius=6, design_size=None):
+    """Nodes linked to neighbors ('radius' or 'knn' mode) as a transparent RGBA layer"""
+    # With design_size, positions, radius and node size are design units and nodes is per design canvas
+    points, edges, node_radius, line_width = _scaled_network(
+        size, design_size, nodes, seed, margin, radius, mode, k, node_radius)
+
+    node_fill = (*color, opacity)
+    edge_fill = (*color, int(opacity * 0.5))
+
+    if np is not None and line_width == 1 and len(edges) > BATCH_EDGES_THRESHOLD:
+        # Dense networks: every edge in one pass, then the nodes on top
+        overlay = Image.new('RGBA', size, (*color, 0))
+        overlay.putalpha(_raster_edges(size, points, edges, edge_fill[3]))
+        draw = ImageDraw.Draw(overlay)
+        for x, y in points:
+            draw.ellipse([(x - node_radius, y - node_radius), (x + node_radius, y + node_radius)], fill=node_fill)
+        return overlay
+
+    # Sparse networks: node i, then its edges to later nodes (the original draw order)
+    overlay = Image.new('RGBA', size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    by_node = defaultdict(list)
+    for i, j in edges:
+        by_node[i].append(j)
+    for i, (x, y) in enumerate(points):
+        draw.ellipse([(x - node_radius, y - node_radius), (x + node_radius, y + node_radius)], fill=node_fill)
+        for j in by_node[i]:
+            draw.line([points[i], points[j]], fill=edge_fill, width=line_width)
+    return overlay
+
+
+def neural_network_frame(size, color, t, opacity=50, seed=789, nodes=12, radius=250,
+                         mode='radius', k=3, margin=100, node_radius=6, design_size=None):
+    """One frame (t in [0, 1), looping) of the network with pulsing nodes and fading edges"""
+    points, edges, node_radius, line_width = _scaled_network(
+        size, design_size, nodes, seed, margin, radius, mode, k, node_radius)
+    overlay = Image.new('RGBA', size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+
+    # Golden-ratio phase offsets spread the motion evenly without extra randomness
+    for index, (i, j) in enumerate(edges):
+        fade = 0.5 - 0.5 * math.cos(2 * math.pi * (t + index * 0.618))
+        draw.line([points[i], points[j]], fill=(*color, int(opacity * 0.5 * fade)), width=line_width)
+    for index, (x, y) in enumerate(points):
+        pulse = math.sin(2 * math.pi * (t + index * 0.618))
+        r = node_radius * (1 + 0.35 * pulse)
+        draw.ellipse([(x - r, y - r), (x + r, y + r)], fill=(*color, int(opacity * (0.75 + 0.25 * pulse))))
+    return overlay
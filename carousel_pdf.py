@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Streaming PDF export for carousel decks
+LinkedIn takes carousels as PDF documents. Pages are encoded in the render
+workers and appended to the file in deck order as they finish, so only a
+window of in-flight pages is ever held in memory
+"""
+
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import io
+import os
+import threading
+import time
+import zlib
+
+from carousel_render import default_workers
+
+COMPRESSIONS = ('jpeg', 'flate')
+
+# One encoded page image: PDF stream filter and its compressed bytes
+PdfPage = namedtuple('PdfPage', 'width height filter data')
+
+# Lowest JPEG quality the size target may push a page down to
+MIN_QUALITY = 40
+
+# Allowance for the page, content and trailer objects around each image
+PAGE_OVERHEAD = 512
+DOCUMENT_OVERHEAD = 1024
+
+
+def _jpeg_page(img, quality):
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=quality, optimize=True, subsampling=0)
+    return PdfPage(img.width, img.height, 'DCTDecode', buffer.getvalue())
+
+
+def encode_page(img, compression='jpeg', quality=90, max_bytes=None):
+    """Compress a slide into a page image, lowering JPEG quality to fit max_bytes"""
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"unknown PDF compression {compression!r} (expected one of {COMPRESSIONS})")
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    if compression == 'flate':
+        page = PdfPage(img.width, img.height, 'FlateDecode', zlib.compress(img.tobytes(), 9))
+        if max_bytes is None or len(page.data) <= max_bytes:
+            return page
+        # Lossless does not fit; fall through to the JPEG search
+
+    page = _jpeg_page(img, quality)
+    if max_bytes is None or len(page.data) <= max_bytes:
+        return page
+
+    # Binary search for the highest quality that fits
+    low, high, best = MIN_QUALITY, quality - 1, None
+    while low <= high:
+        mid = (low + high) // 2
+        candidate = _jpeg_page(img, mid)
+        if len(candidate.data) <= max_bytes:
+            best, low = candidate, mid + 1
+        else:
+            high = mid - 1
+    return best or _jpeg_page(img, MIN_QUALITY)
+
+
+class PdfWriter:
+    """Minimal PDF writer that appends one image page at a time"""
+
+    # Object 1 is the catalog and 2 the page tree; both are written on close
+    _CATALOG, _PAGES = 1, 2
+
+    def __init__(self, path):
+        self.path = path
+        self.pages = []
+        self._offsets = {}
+        self._next_id = 3
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        self._file = open(self._tmp_path, 'wb')
+        self._file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    @property
+    def bytes_written(self):
+        return self._file.tell()
+
+    def _object(self, obj_id, body, stream=None):
+        self._offsets[obj_id] = self._file.tell()
+        self._file.write(f"{obj_id} 0 obj\n".encode())
+        self._file.write(body.encode())
+        if stream is not None:
+            self._file.write(b"\nstream\n")
+            self._file.write(stream)
+            self._file.write(b"\nendstream")
+        self._file.write(b"\nendobj\n")
+
+    def _reserve(self, n):
+        first = self._next_id
+        self._next_id += n
+        return range(first, first + n)
+
+    def add_page(self, page):
+        """Write one page (image, content stream, page object) and release it"""
+        image_id, content_id, page_id = self._reserve(3)
+        self._object(
+            image_id,
+            f"<< /Type /XObject /Subtype /Image /Width {page.width} /Height {page.height} "
+            f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /{page.filter} /Length {len(page.data)} >>",
+            page.data,
+        )
+        content = f"q {page.width} 0 0 {page.height} 0 0 cm /Im0 Do Q".encode()
+        self._object(content_id, f"<< /Length {len(content)} >>", content)
+        self._object(
+            page_id,
+            f"<< /Type /Page /Parent {self._PAGES} 0 R /MediaBox [0 0 {page.width} {page.height}] "
+            f"/Resources << /XObject << /Im0 {image_id} 0 R >> >> /Contents {content_id} 0 R >>",
+        )
+        self.pages.append(page_id)
+
+    def close(self):
+        """Write the page tree, catalog and xref, then move the file into place"""
+        kids = " ".join(f"{page_id} 0 R" for page_id in self.pages)
+        self._object(self._PAGES, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.pages)} >>")
+        self._object(self._CATALOG, f"<< /Type /Catalog /Pages {self._PAGES} 0 R >>")
+
+        xref = self._file.tell()
+        self._file.write(f"xref\n0 {self._next_id}\n0000000000 65535 f \n".encode())
+        for obj_id in range(1, self._next_id):
+            self._file.write(f"{self._offsets[obj_id]:010d} 00000 n \n".encode())
+        self._file.write(
+            f"trailer\n<< /Size {self._next_id} /Root {self._CATALOG} 0 R >>\n"
+            f"startxref\n{xref}\n%%EOF\n".encode()
+        )
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        return self.path
+
+    def abort(self):
+        self._file.close()
+        os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def page_budget(max_bytes, pages):
+    """Split a document size target evenly across its pages"""
+    if not max_bytes:
+        return None
+    budget = (max_bytes - DOCUMENT_OVERHEAD) // max(1, pages) - PAGE_OVERHEAD
+    if budget <= 0:
+        raise ValueError(f"a {max_bytes}-byte target cannot hold {pages} pages")
+    return budget
+
+
+def _page_job(job, compression, quality, max_bytes):
+    """Build one slide and encode it as a page inside a worker"""
+    start = time.perf_counter()
+    slide = job.builder(*job.args, **job.kwargs)
+    page = encode_page(slide, compression, quality, max_bytes)
+    return page, time.perf_counter() - start
+
+
+def render_pdf(jobs, path, workers=None, executor='process', compression='jpeg',
+               quality=90, max_size=None, log=print):
+    """Render jobs into a single PDF at path, streaming pages in deck order"""
+    workers = min(workers or default_workers(), len(jobs))
+    budget = page_budget(max_size, len(jobs))
+    start = time.perf_counter()
+
+    def write(writer, job, result):
+        page, seconds = result
+        writer.add_page(page)
+        if log:
+            log(f"  {job.label or job.filename:<55} {seconds * 1000:8.1f} ms {len(page.data) / 1024:8.1f} KB")
+
+    with PdfWriter(path) as writer:
+        if workers <= 1:
+            for job in jobs:
+                write(writer, job, _page_job(job, compression, quality, budget))
+        else:
+            # Keep `workers` pages in flight and append them in order as they land
+            pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+            remaining = iter(jobs)
+            pending = deque()
+            with pool_class(max_workers=workers) as pool:
+                for job in remaining:
+                    pending.append((job, pool.submit(_page_job, job, compression, quality, budget)))
+                    if len(pending) == workers:
+                        break
+                while pending:
+                    job, future = pending.popleft()
+                    write(writer, job, future.result())
+                    for next_job in remaining:
+                        pending.append((next_job, pool.submit(_page_job, next_job, compression, quality, budget)))
+                        break
+
+    size = os.path.getsize(path)
+    if log:
+        log(f"  → {path}: {len(jobs)} pages, {size / 1024:.1f} KB in {time.perf_counter() - start:.2f}s")
+        if max_size and size > max_size:
+            log(f"  ! {path} is over the {max_size / 1024:.0f} KB target even at JPEG quality {MIN_QUALITY}")
+    return path
+
+
+def parse_bytes(value):
+    """'8MB', '500k' or a plain byte count -> bytes"""
+    value = str(value).strip().upper().rstrip('B')
+    for suffix, scale in (('K', 1024), ('M', 1024 ** 2), ('G', 1024 ** 3)):
+        if value.endswith(suffix):
+            return int(float(value[:-1]) * scale)
+    return int(value)
+
+
+def add_pdf_arguments(parser):
+    """PDF export options for the deck CLI"""
+    parser.add_argument('--pdf', action='store_true',
+                        help="write each deck as one multi-page PDF instead of loose images")
+    parser.add_argument('--pdf-compression', choices=COMPRESSIONS, default='jpeg',
+                        help="page image compression (default: jpeg)")
+    parser.add_argument('--pdf-quality', type=int, default=90,
+                        help="JPEG page quality before any size-target reduction (default: 90)")
+    parser.add_argument('--max-pdf-size', type=parse_bytes, default=None,
+                        help="target document size, e.g. 8MB; pages drop JPEG quality to fit")
+    return parser
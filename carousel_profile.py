@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Per-stage profiling for the carousel generators
+Stages record wall and CPU time, full-frame pixel allocations and tracemalloc
+peaks, and export a Chrome trace (chrome://tracing, ui.perfetto.dev) plus a
+summary table. While the profiler is off a stage costs one attribute check.
+tracemalloc keeps a single process-wide peak, so when stages run on several
+threads at once their Python peaks are approximate and reported as such
+"""
+
+from collections import namedtuple
+from contextlib import contextmanager, nullcontext
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+from carousel_layers import FRAME_ALLOCATIONS
+
+DEFAULT_TRACE_PATH = "carousel_trace.json"
+
+# One finished stage; times in ns, py_peak in bytes above the heap size at entry
+# (approximate when other threads were profiled concurrently: the peak is process-wide)
+StageEvent = namedtuple('StageEvent', 'name start wall cpu frames pixels py_peak thread')
+
+
+class _Frame:
+    """An open stage on one thread's stack"""
+
+    __slots__ = ('name', 'start', 'cpu', 'frames', 'pixels', 'heap', 'peak')
+
+    def __init__(self, name):
+        self.name = name
+        self.frames = FRAME_ALLOCATIONS.count
+        self.pixels = FRAME_ALLOCATIONS.pixels
+        self.heap = tracemalloc.get_traced_memory()[0]
+        self.peak = self.heap
+        tracemalloc.reset_peak()
+        self.cpu = time.thread_time_ns()
+        self.start = time.perf_counter_ns()
+
+
+class Profiler:
+    """Collects stage events from every thread while enabled"""
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.threads = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+        self._started_tracemalloc = False
+
+    def start(self):
+        self.events.clear()
+        self._origin = time.perf_counter_ns()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def _stage(self, name):
+        stack = self._stack()
+        if stack:
+            # The child resets the heap peak, so fold the parent's peak so far first
+            parent = stack[-1]
+            parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+        frame = _Frame(name)
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            cpu = time.thread_time_ns() - frame.cpu
+            stack.pop()
+            peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            thread = threading.current_thread()
+            event = StageEvent(
+                name, frame.start - self._origin, end - frame.start, cpu,
+                FRAME_ALLOCATIONS.count - frame.frames, FRAME_ALLOCATIONS.pixels - frame.pixels,
+                peak - frame.heap, thread.ident,
+            )
+            with self._lock:
+                self.threads.setdefault(thread.ident, thread.name)
+                self.events.append(event)
+
+    def stage(self, name):
+        """Context manager timing one stage; a shared no-op while disabled"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._stage(name)
+
+    @property
+    def concurrent(self):
+        """Whether stages were recorded on more than one thread, sharing tracemalloc's peak"""
+        return len({event.thread for event in self.events}) > 1
+
+    def chrome_trace(self):
+        """Events in Chrome trace-event format ('X' complete events, microseconds)"""
+        pid = os.getpid()
+        trace = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+            for tid, name in self.threads.items()
+        ]
+        for event in self.events:
+            trace.append({
+                'name': event.name, 'cat': 'carousel', 'ph': 'X', 'pid': pid, 'tid': event.thread,
+                'ts': event.start / 1000, 'dur': event.wall / 1000,
+                'args': {
+                    'cpu_ms': round(event.cpu / 1e6, 3),
+                    'frames': event.frames,
+                    'megapixels': round(event.pixels / 1e6, 3),
+                    'py_peak_kb': round(event.py_peak / 1024, 1),
+                },
+            })
+        return {'traceEvents': trace, 'displayTimeUnit': 'ms',
+                'otherData': {'py_peak_approximate': self.concurrent}}
+
+    def write_trace(self, path=DEFAULT_TRACE_PATH):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+    def summary(self):
+        """Per-stage totals, slowest first; nested stages are included in their parents
+
+        frames/Mpx come from the process-wide allocation counter and py peak
+        from tracemalloc's process-wide peak, so stages running concurrently on
+        other threads (the writer, thread workers) share counts and peaks
+        """
+        totals = {}
+        for event in self.events:
+            row = totals.setdefault(event.name, [0, 0, 0, 0, 0, 0])
+            row[0] += 1
+            row[1] += event.wall
+            row[2] += event.cpu
+            row[3] += event.frames
+            row[4] += event.pixels
+            row[5] = max(row[5], event.py_peak)
+
+        lines = [f"  {'stage':<40} {'calls':>5} {'wall ms':>9} {'cpu ms':>9} {'frames':>6} {'Mpx':>7} {'py peak KB':>10}"]
+        for name, (calls, wall, cpu, frames, pixels, py_peak) in sorted(
+                totals.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {name[:40]:<40} {calls:5d} {wall / 1e6:9.1f} {cpu / 1e6:9.1f} "
+                         f"{frames:6d} {pixels / 1e6:7.1f} {py_peak / 1024:10.1f}")
+        if self.concurrent:
+            lines.append("  (py peak is approximate: stages ran on several threads and share one tracemalloc peak)")
+        return "\n".join(lines)
+
+
+_NULL_STAGE = nullcontext()
+
+# Process-wide profiler shared by every generator module
+PROFILER = Profiler()
+
+
+def stage(name):
+    return PROFILER.stage(name)
+
+
+def profiled(name=None):
+    """Decorator recording every call as a stage while the profiler is enabled"""
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return fn(*args, **kwargs)
+            with PROFILER._stage(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def add_profile_arguments(parser):
+    """--profile [TRACE] option for the generator scripts"""
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_TRACE_PATH, default=None, metavar='TRACE',
+                        help=f"profile every stage in-process, write a Chrome trace (default: {DEFAULT_TRACE_PATH}) "
+                             "and print a summary")
+    return parser
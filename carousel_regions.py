@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Dirty-region re-rendering for layered slides
+A slide's text layer is first run against an ElementLog, which records every
+drawn element with the box it can touch (glows include their blur margin)
+instead of painting it. Re-rendering a slide whose background was rendered
+before diffs its elements against that last render and repaints only the
+changed rectangles over the cached base, so a new headline or a personalized
+name costs a few small crops instead of a full frame
+"""
+
+from PIL import Image, ImageDraw, ImageFont
+from collections import OrderedDict, namedtuple
+from difflib import SequenceMatcher
+from functools import wraps
+import inspect
+import math
+import threading
+
+# Above this share of the frame a full render is cheaper than patching rectangles
+MAX_DIRTY_FRACTION = 0.5
+
+# Memory for kept renders (a base and its output: 8 MB per 1080 px slide, 58 MB at 4K)
+REGION_BYTES = 96 * 2 ** 20
+
+# Backgrounds remembered as rendered once, to spot the ones that recur
+_SEEN_KEYS = 256
+
+# One drawn element: hashable description, (left, top, right, bottom) it can touch
+# (None: unbounded) and paint(img, origin) drawing it onto a crop whose corner is origin
+Element = namedtuple('Element', 'key box paint')
+
+# Last render of one slide base: straight RGBA background, finished RGB output, its elements
+_Entry = namedtuple('_Entry', 'base output elements lock')
+
+
+def element_key(value):
+    """Hashable, content-based stand-in for a drawing argument"""
+    if isinstance(value, ImageFont.FreeTypeFont):
+        return ('font', value.path, value.size, value.index)
+    if isinstance(value, (list, tuple)):
+        return tuple(element_key(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((name, element_key(item)) for name, item in value.items()))
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    if callable(value):
+        return f"{value.__module__}.{getattr(value, '__qualname__', repr(value))}"
+    return repr(value)
+
+
+def union(*boxes):
+    """Smallest box covering every box"""
+    return (min(box[0] for box in boxes), min(box[1] for box in boxes),
+            max(box[2] for box in boxes), max(box[3] for box in boxes))
+
+
+def overlaps(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _shifted(position, origin):
+    return position[0] - origin[0], position[1] - origin[1]
+
+
+def recorded(bounds):
+    """Decorate a drawing primitive fn(img, ..., position, ...) so an ElementLog records it
+
+    bounds(**arguments) returns the box a call can touch; the img and draw
+    arguments are left out, and position is shifted when the element is
+    repainted onto a crop
+    """
+    def decorate(fn):
+        signature = inspect.signature(fn)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not args or not isinstance(args[0], ElementLog):
+                return fn(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {name: value for name, value in bound.arguments.items() if name not in ('img', 'draw')}
+
+            def paint(img, origin=(0, 0)):
+                call = dict(arguments, img=img, position=_shifted(arguments['position'], origin))
+                if 'draw' in signature.parameters:
+                    call['draw'] = ImageDraw.Draw(img)
+                fn(**call)
+
+            args[0].add((fn.__qualname__, element_key(arguments)), bounds(**arguments), paint)
+        return wrapper
+    return decorate
+
+
+def _points(xy):
+    """[(x, y), ...] from ImageDraw's flat or paired coordinate forms"""
+    xy = list(xy)
+    if xy and isinstance(xy[0], (int, float)):
+        return list(zip(xy[0::2], xy[1::2]))
+    return [tuple(point) for point in xy]
+
+
+class RecordingDraw:
+    """ImageDraw stand-in for an ElementLog: shapes are recorded with their boxes, measurements pass through"""
+
+    def __init__(self, log):
+        self._log = log
+        self._measure = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+
+    def textbbox(self, *args, **kwargs):
+        return self._measure.textbbox(*args, **kwargs)
+
+    def textlength(self, *args, **kwargs):
+        return self._measure.textlength(*args, **kwargs)
+
+    def _shape(self, name, xy, pad, **options):
+        points = _points(xy)
+        box = (min(x for x, _ in points) - pad, min(y for _, y in points) - pad,
+               max(x for x, _ in points) + pad + 1, max(y for _, y in points) + pad + 1)
+
+        def paint(img, origin=(0, 0)):
+            getattr(ImageDraw.Draw(img), name)([_shifted(point, origin) for point in points], **options)
+
+        self._log.add((name, element_key(points), element_key(options)), box, paint)
+
+    def line(self, xy, fill=None, width=0, joint=None):
+        self._shape('line', xy, width, fill=fill, width=width, joint=joint)
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        self._shape('rectangle', xy, width, fill=fill, outline=outline, width=width)
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        self._shape('ellipse', xy, width, fill=fill, outline=outline, width=width)
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        self._shape('polygon', xy, width, fill=fill, outline=outline, width=width)
+
+    def text(self, xy, text, fill=None, font=None, **options):
+        left, top, right, bottom = self._measure.textbbox(xy, text, font=font, **options)
+
+        def paint(img, origin=(0, 0)):
+            ImageDraw.Draw(img).text(_shifted(xy, origin), text, fill=fill, font=font, **options)
+
+        self._log.add(('text', element_key((xy, text, fill, font, options))), (left - 1, top - 1, right + 1, bottom + 1),
+                      paint)
+
+    def __getattr__(self, name):
+        return self._log.unbounded(name, lambda img: getattr(ImageDraw.Draw(img), name))
+
+
+class ElementLog:
+    """Stands in for the image a text layer draws into, recording elements instead of pixels"""
+
+    def __init__(self, size, mode='RGBA'):
+        self.size = size
+        self.width, self.height = size
+        self.mode = mode
+        self.elements = []
+        self.draw = RecordingDraw(self)
+
+    def add(self, key, box, paint):
+        if box is not None:
+            # Whole pixels the element can touch, inside the frame
+            box = (max(0, math.floor(box[0])), max(0, math.floor(box[1])),
+                   min(self.width, math.ceil(box[2])), min(self.height, math.ceil(box[3])))
+        self.elements.append(Element(key, box, paint))
+
+    def unbounded(self, name, method):
+        """A drawing call whose reach is unknown: recorded as touching the whole frame"""
+        def record(*args, **kwargs):
+            self.add((name, element_key((args, kwargs))), None,
+                     lambda img, origin=(0, 0): method(img)(*args, **kwargs))
+        return record
+
+    def __getattr__(self, name):
+        return self.unbounded(name, lambda img: getattr(img, name))
+
+
+def record_elements(layers):
+    """Elements a slide's text layer draws, without painting anything"""
+    log = ElementLog(layers.canvas.raster_size)
+    layers.text(log, log.draw)
+    return log.elements
+
+
+def dirty_boxes(old, new):
+    """Boxes of the elements drawn differently between two renders, or None if any is unbounded"""
+    signature = [(element.key, element.box) for element in old]
+    changed = []
+    matcher = SequenceMatcher(None, signature, [(element.key, element.box) for element in new], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != 'equal':
+            changed.extend(old[i1:i2])
+            changed.extend(new[j1:j2])
+    if any(element.box is None for element in changed):
+        return None
+    return [element.box for element in changed if element.box[0] < element.box[2] and element.box[1] < element.box[3]]
+
+
+def merge_boxes(boxes, align=1):
+    """Union overlapping boxes (snapped outward to multiples of align) until none overlap"""
+    merged = []
+    for box in boxes:
+        box = (box[0] // align * align, box[1] // align * align, -(-box[2] // align) * align, -(-box[3] // align) * align)
+        while True:
+            touching = [other for other in merged if overlaps(box, other)]
+            if not touching:
+                break
+            merged = [other for other in merged if other not in touching]
+            box = union(box, *touching)
+        merged.append(box)
+    return merged
+
+
+class RegionCache:
+    """Last render of each recurring slide base, so re-renders repaint only their dirty rectangles
+
+    base(layers) returns the straight RGBA background raster and
+    compose(layers, base) the finished RGB slide, exactly as a full render
+    does. A background rendered once goes straight through; its pixels are
+    only kept once it comes back
+    """
+
+    def __init__(self, base, compose, max_bytes=REGION_BYTES):
+        self.base = base
+        self.compose = compose
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.full = 0
+        self.partial = 0
+        self.unchanged = 0
+        self._items = OrderedDict()
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, layers):
+        """Finished RGB slide for layers, repainting over the last render of the same base when there is one"""
+        canvas = layers.canvas
+        key = element_key((canvas.raster_size, canvas.supersample, layers.background))
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                self._items.move_to_end(key)
+            recurring = entry is not None or key in self._seen
+            self._seen[key] = True
+            self._seen.move_to_end(key)
+            while len(self._seen) > _SEEN_KEYS:
+                self._seen.popitem(last=False)
+
+        # With no memory budget nothing could be kept, so skip recording the elements too
+        if not recurring or not self.max_bytes:
+            with self._lock:
+                self.full += 1
+            return self.compose(layers, self.base(layers))
+
+        elements = record_elements(layers)
+        if entry is not None:
+            with entry.lock:
+                rects = self._dirty_rects(entry.elements, elements, canvas)
+                if rects is not None:
+                    for rect in rects:
+                        self._repaint(entry, rect, elements, canvas)
+                    entry.elements[:] = elements
+                    with self._lock:
+                        if rects:
+                            self.partial += 1
+                        else:
+                            self.unchanged += 1
+                    return entry.output.copy()
+
+        base = self.base(layers)
+        # compose draws into the raster it is given; the kept base stays clean
+        output = self.compose(layers, base.copy())
+        self._remember(key, _Entry(base, output.copy(), list(elements), threading.Lock()))
+        return output
+
+    @staticmethod
+    def _dirty_rects(old, new, canvas):
+        """Rectangles to repaint, or None when a full render is the better deal
+
+        An unbounded element may touch any pixel, so even an unchanged one forces a full render
+        """
+        if any(element.box is None for element in new):
+            return None
+        boxes = dirty_boxes(old, new)
+        if boxes is None:
+            return None
+        rects = merge_boxes(boxes, canvas.supersample)
+        if sum((r[2] - r[0]) * (r[3] - r[1]) for r in rects) > MAX_DIRTY_FRACTION * canvas.width * canvas.height:
+            return None
+        return rects
+
+    @staticmethod
+    def _repaint(entry, rect, elements, canvas):
+        """Redraw one rectangle from the base and every element that reaches into it"""
+        region = entry.base.crop(rect)
+        for element in elements:
+            if overlaps(element.box, rect):
+                element.paint(region, rect[:2])
+        region = canvas.finish(region.convert('RGB'))
+        entry.output.paste(region, (rect[0] // canvas.supersample, rect[1] // canvas.supersample))
+
+    @staticmethod
+    def _entry_bytes(entry):
+        return entry.base.width * entry.base.height * 4 + entry.output.width * entry.output.height * 3
+
+    def _remember(self, key, entry):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes -= self._entry_bytes(old)
+            self._items[key] = entry
+            self.bytes += self._entry_bytes(entry)
+            self.full += 1
+            # A slide larger than the whole budget is simply not kept
+            while self._items and self.bytes > self.max_bytes:
+                _, old = self._items.popitem(last=False)
+                self.bytes -= self._entry_bytes(old)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._seen.clear()
+            self.bytes = 0
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Render scheduler for the carousel generators
+Fans independent slide builders out to a process or thread pool and saves
+each slide as soon as it finishes; serial renders hand slides to a background
+writer so encoding overlaps the next build
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import os
+import time
+
+from carousel_encode import DEFAULT_PRESET, AsyncWriter, available_presets, output_path, save_image
+from carousel_profile import stage
+
+# One slide to render: builder(*args, **kwargs) must return a PIL image saved to filename
+# (encoding names a carousel_encode preset; the extension follows it)
+SlideJob = namedtuple('SlideJob', 'filename builder args kwargs label encoding')
+SlideJob.__new__.__defaults__ = ((), {}, None, None)
+
+# Timing record returned for every rendered slide
+SlideResult = namedtuple('SlideResult', 'filename path seconds')
+
+
+def _job_path(job, output_dir, encoding):
+    path = os.path.join(output_dir, job.filename) if output_dir else job.filename
+    return output_path(path, encoding)
+
+
+def _render_job(job, output_dir, encoding=None):
+    """Build and save one slide inside a worker, returning its timing"""
+    start = time.perf_counter()
+    encoding = encoding or job.encoding or DEFAULT_PRESET
+    slide = job.builder(*job.args, **job.kwargs)
+    path = _job_path(job, output_dir, encoding)
+    save_image(slide, path, encoding)
+    return SlideResult(job.filename, path, time.perf_counter() - start)
+
+
+def default_workers():
+    """One worker per core"""
+    return os.cpu_count() or 1
+
+
+def render_slides(jobs, output_dir=None, workers=None, executor='process', log=print, encoding=None):
+    """Render jobs with `workers` parallel workers, logging each slide as it completes
+
+    encoding overrides every job's preset; serial timings cover the build only,
+    since the writer thread encodes while the next slide renders
+    """
+    workers = workers or default_workers()
+    labels = {job.filename: job.label or job.filename for job in jobs}
+    results = []
+
+    def report(result):
+        results.append(result)
+        if log:
+            log(f"  {labels[result.filename]:<55} {result.seconds * 1000:8.1f} ms")
+
+    if workers == 1 or len(jobs) == 1:
+        with AsyncWriter(encoding or DEFAULT_PRESET) as writer:
+            for job in jobs:
+                start = time.perf_counter()
+                with stage(labels[job.filename].strip()):
+                    slide = job.builder(*job.args, **job.kwargs)
+                job_encoding = encoding or job.encoding or DEFAULT_PRESET
+                path = _job_path(job, output_dir, job_encoding)
+                writer.submit(slide, path, job_encoding)
+                report(SlideResult(job.filename, path, time.perf_counter() - start))
+        return results
+
+    pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    with pool_class(max_workers=min(workers, len(jobs))) as pool:
+        futures = [pool.submit(_render_job, job, output_dir, encoding) for job in jobs]
+        for future in as_completed(futures):
+            report(future.result())
+
+    return results
+
+
+def add_render_arguments(parser):
+    """Shared --workers/--threads/--format options for the generator scripts"""
+    parser.add_argument('--workers', type=int, default=None,
+                        help="parallel slide renders (default: one per core, 1 = serial)")
+    parser.add_argument('--threads', action='store_true',
+                        help="use a thread pool instead of a process pool")
+    parser.add_argument('--format', default=None, choices=available_presets(),
+                        help=f"output encoder preset (default: the deck's format, else {DEFAULT_PRESET})")
+    return parser
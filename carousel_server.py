@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Local HTTP render service for the carousel slide builders
+A long-running process keeps fonts and background layers warm in a bounded
+worker pool. Identical concurrent requests share one render, and responses
+carry an ETag derived from the slide's content key, so revalidations and
+repeats are answered from the cache without rendering
+
+    GET  /decks/<deck>/<slide file>[?size=link&format=webp]
+    POST /render   {"renderer": "v2", "layout": "sign", "args": {...}, "size": "link", "format": "png"}
+    GET  /stats
+"""
+
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+
+from carousel_build import DEFAULT_STORE_DIR, SlideStore, slide_key
+from carousel_deck import RENDERERS, deck_jobs, find_decks, load_deck, renderer_layouts
+from carousel_encode import DEFAULT_PRESET, PRESETS, encode, get_preset
+from carousel_fonts import get_font
+from carousel_layout import parse_size, size_suffix
+from carousel_render import SlideJob, default_workers
+
+DECKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "decks")
+
+CONTENT_TYPES = {
+    '.png': 'image/png', '.webp': 'image/webp', '.jpg': 'image/jpeg', '.avif': 'image/avif',
+}
+
+# Deck URLs are stable while their copy changes, so clients revalidate with the ETag
+DEFAULT_MAX_AGE = 300
+
+# Seconds a request waits for a free render slot before it is turned away with a 503
+QUEUE_TIMEOUT = 30
+
+# Largest raster (width x height x supersample^2) a request may ask for: one 4K frame
+MAX_PIXELS = 3840 * 2160
+
+
+class ServiceBusy(RuntimeError):
+    """Every render slot stayed taken for QUEUE_TIMEOUT seconds"""
+
+
+def _warm_worker(renderers):
+    """Pool initializer: import the generators and load their common font sizes once"""
+    for renderer in renderers:
+        renderer_layouts(renderer)
+    for size in (28, 30, 34, 36, 42, 52, 58, 64, 68, 85, 180):
+        get_font(size)
+
+
+def _render_encoded(job, preset):
+    """Build one slide inside a worker and return the encoded bytes"""
+    return encode(job.builder(*job.args, **job.kwargs), preset).getvalue()
+
+
+class ByteCache:
+    """LRU of encoded slides bounded by total bytes"""
+
+    def __init__(self, max_bytes=256 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            if key in self._items:
+                return
+            self._items[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes and len(self._items) > 1:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class RenderService:
+    """Content-keyed cache in front of a warm worker pool, with request coalescing"""
+
+    def __init__(self, workers=None, executor='process', decks_dir=DECKS_DIR, store_dir=DEFAULT_STORE_DIR,
+                 cache_bytes=256 * 2 ** 20, max_pending=None, max_pixels=MAX_PIXELS):
+        workers = workers or default_workers()
+        pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+        self.pool = pool_class(max_workers=workers, initializer=_warm_worker, initargs=(tuple(RENDERERS),))
+        self.cache = ByteCache(cache_bytes)
+        self.store = SlideStore(store_dir) if store_dir else None
+        self.decks_dir = decks_dir
+        self.max_pixels = max_pixels
+        self.stats = {'requests': 0, 'memory_hits': 0, 'disk_hits': 0, 'renders': 0,
+                      'coalesced': 0, 'not_modified': 0, 'rejected': 0, 'store_errors': 0}
+        self._latencies = deque(maxlen=1000)
+        self._decks = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        # Bounds queued renders so a burst of distinct requests cannot grow without limit
+        self._slots = threading.BoundedSemaphore(max_pending or workers * 4)
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def deck(self, name):
+        """Deck spec by name, reloaded whenever its file changes"""
+        for path in find_decks([self.decks_dir]):
+            mtime = os.stat(path).st_mtime_ns
+            cached = self._decks.get(path)
+            if cached is None or cached[0] != mtime:
+                cached = self._decks[path] = (mtime, load_deck(path))
+            if cached[1]['name'] == name:
+                return cached[1]
+        raise LookupError(f"no deck named {name!r} in {self.decks_dir}")
+
+    def check_size(self, job):
+        """Reject a job whose raster would exceed max_pixels before it reaches the pool"""
+        width, height = parse_size(job.kwargs.get('size') or (1080, 1080))
+        supersample = job.kwargs.get('supersample') or 1
+        if not isinstance(supersample, int) or supersample < 1:
+            raise ValueError(f"supersample must be a positive integer, not {supersample!r}")
+        if width < 1 or height < 1 or width * height * supersample ** 2 > self.max_pixels:
+            raise ValueError(f"{width}x{height} at supersample {supersample} is outside the "
+                             f"{self.max_pixels}-pixel render limit")
+        return job
+
+    def deck_job(self, deck_name, filename, size=None):
+        if size:
+            # Fail on an oversized request before expanding the deck
+            self.check_size(SlideJob(filename, None, (), {'size': size}))
+        deck = self.deck(deck_name)
+        stem = os.path.splitext(filename)[0]
+        wanted = (stem, stem + size_suffix(size)) if size else (stem,)
+        for job in deck_jobs(deck, sizes=[size] if size else None):
+            if os.path.splitext(os.path.basename(job.filename))[0] in wanted:
+                return self.check_size(job)
+        raise LookupError(f"deck {deck_name!r} has no slide {filename!r}")
+
+    def adhoc_job(self, spec):
+        """Job for a POST /render body"""
+        if not isinstance(spec, dict):
+            raise ValueError("the request body must be a JSON object")
+        layouts = renderer_layouts(spec.get('renderer', 'v2'))
+        layout = spec.get('layout')
+        if layout not in layouts:
+            raise LookupError(f"unknown layout {layout!r}")
+        kwargs = dict(spec.get('args') or {})
+        if spec.get('size'):
+            kwargs['size'] = parse_size(spec['size'])
+        return self.check_size(SlideJob('render', layouts[layout], (), kwargs))
+
+    def key(self, job, preset):
+        """Content key of a job; raises TypeError for arguments the builder rejects"""
+        return slide_key(job, preset)
+
+    def _produce(self, key, job, preset):
+        """Disk store or a pool render for a key nobody else is producing"""
+        if self.store is not None:
+            path = self.store.lookup(key)
+            if path:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                self._count('disk_hits')
+                return data
+        if not self._slots.acquire(timeout=QUEUE_TIMEOUT):
+            self._count('rejected')
+            raise ServiceBusy(f"no render slot free after {QUEUE_TIMEOUT}s")
+        try:
+            data = self.pool.submit(_render_encoded, job, preset).result()
+        finally:
+            self._slots.release()
+        self._count('renders')
+        if self.store is not None:
+            try:
+                self._store(key, data, preset)
+            except OSError:
+                # The render succeeded; a store that cannot be written only costs a later re-render
+                self._count('store_errors')
+        return data
+
+    def _store(self, key, data, preset):
+        staging = os.path.join(self.store.store_dir, "staging",
+                               f"{key}.{os.getpid()}.{threading.get_ident()}{PRESETS[preset].extension}")
+        os.makedirs(os.path.dirname(staging), exist_ok=True)
+        with open(staging, 'wb') as f:
+            f.write(data)
+        self.store.ingest(key, staging)
+        self.store.save()
+
+    def get(self, key, job, preset):
+        """Encoded bytes for a key: memory, then disk, then one shared render"""
+        data = self.cache.get(key)
+        if data is not None:
+            self._count('memory_hits')
+            return data
+
+        with self._lock:
+            waiter = self._inflight.get(key)
+            if waiter is None:
+                waiter = self._inflight[key] = {'event': threading.Event(), 'data': None, 'error': None}
+                owner = True
+            else:
+                self.stats['coalesced'] += 1
+                owner = False
+
+        if not owner:
+            waiter['event'].wait()
+            if waiter['error'] is not None:
+                raise waiter['error']
+            return waiter['data']
+
+        try:
+            waiter['data'] = self._produce(key, job, preset)
+            self.cache.put(key, waiter['data'])
+            return waiter['data']
+        except Exception as exc:
+            waiter['error'] = exc
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            waiter['event'].set()
+
+    def record_latency(self, seconds):
+        self._latencies.append(seconds)
+
+    def report(self):
+        latencies = sorted(self._latencies)
+        report = dict(self.stats, cached_bytes=self.cache.size)
+        if latencies:
+            report['p50_ms'] = round(statistics.median(latencies) * 1000, 2)
+            report['p95_ms'] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 2)
+        return report
+
+    def close(self):
+        self.pool.shutdown()
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    """Routes requests to the server's RenderService"""
+
+    server_version = "CarouselRender/1"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body=b"", content_type='application/json', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({'error': message}).encode())
+
+    def _serve(self, job, preset, max_age):
+        start = time.perf_counter()
+        self.service._count('requests')
+        try:
+            get_preset(preset)
+            key = self.service.key(job, preset)
+        except (TypeError, ValueError, RuntimeError) as exc:
+            return self._error(400, str(exc))
+
+        etag = f'"{key[:32]}"'
+        headers = {'ETag': etag, 'Cache-Control': f"public, max-age={max_age}" if max_age else 'no-cache'}
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            self.service._count('not_modified')
+            self._send(304, headers=headers)
+        else:
+            try:
+                data = self.service.get(key, job, preset)
+            except ServiceBusy as exc:
+                return self._send(503, json.dumps({'error': str(exc)}).encode(), headers={'Retry-After': '5'})
+            except Exception as exc:
+                return self._error(500, f"render failed: {exc}")
+            self._send(200, data, CONTENT_TYPES.get(PRESETS[preset].extension, 'application/octet-stream'), headers)
+        self.service.record_latency(time.perf_counter() - start)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.strip('/').split('/')]
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        if parts == ['stats']:
+            return self._send(200, json.dumps(self.service.report()).encode())
+        if parts == ['healthz']:
+            return self._send(200, b'{"ok": true}')
+        if len(parts) == 3 and parts[0] == 'decks':
+            try:
+                job = self.service.deck_job(parts[1], parts[2], query.get('size'))
+            except LookupError as exc:
+                return self._error(404, str(exc))
+            except ValueError as exc:
+                return self._error(400, str(exc))
+            ext_preset = {'.webp': 'webp', '.jpg': 'jpeg', '.avif': 'avif'}.get(os.path.splitext(parts[2])[1])
+            preset = query.get('format') or ext_preset or job.encoding or DEFAULT_PRESET
+            return self._serve(job, preset, self.server.max_age)
+        self._error(404, f"no route for {url.path}")
+
+    do_HEAD = do_GET
+
+    def do_POST(self):
+        if urlsplit(self.path).path.rstrip('/') != '/render':
+            return self._error(404, f"no route for {self.path}")
+        try:
+            spec = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+            job = self.service.adhoc_job(spec)
+        except (json.JSONDecodeError, LookupError, ValueError, TypeError, AttributeError) as exc:
+            return self._error(400, str(exc))
+        # The body is the content, so the response never changes for a given ETag
+        self._serve(job, spec.get('format', DEFAULT_PRESET), 31536000)
+
+
+class RenderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service, max_age=DEFAULT_MAX_AGE, verbose=False):
+        super().__init__(address, RenderHandler)
+        self.service = service
+        self.max_age = max_age
+        self.verbose = verbose
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve carousel slides over HTTP from a warm render pool")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None, help="render workers (default: one per core)")
+    parser.add_argument('--threads', action='store_true', help="use a thread pool instead of a process pool")
+    parser.add_argument('--decks', default=DECKS_DIR, help="directory of deck specs served under /decks")
+    parser.add_argument('--max-age', type=int, default=DEFAULT_MAX_AGE,
+                        help=f"Cache-Control max-age for deck slides (default: {DEFAULT_MAX_AGE}s)")
+    parser.add_argument('--cache-mb', type=int, default=256, help="in-memory cache size (default: 256 MB)")
+    parser.add_argument('--max-pixels', type=int, default=MAX_PIXELS,
+                        help=f"largest raster a request may render, width x height x supersample^2 "
+                             f"(default: {MAX_PIXELS})")
+    parser.add_argument('--verbose', action='store_true', help="log every request")
+    args = parser.parse_args(argv)
+
+    service = RenderService(args.workers, 'thread' if args.threads else 'process', args.decks,
+                            cache_bytes=args.cache_mb * 2 ** 20, max_pixels=args.max_pixels)
+    server = RenderServer((args.host, args.port), service, args.max_age, args.verbose)
+    print(f"Serving carousel renders on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
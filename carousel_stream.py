@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Memory-bounded streaming pipeline for large batch renders
+Generator stages (spec -> layout -> raster -> encode -> write) hand one slide
+at a time down the chain: decks load lazily, each raster is closed as soon as
+it is encoded, and a memory budget bounds the renders in flight by their
+estimated working sets and trims the layer caches whenever resident memory
+crosses it. The budget is a soft target, not a cap: estimates are
+approximate, and a slide larger than the whole budget still renders, alone
+"""
+
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import argparse
+import ctypes
+import ctypes.util
+import gc
+import os
+import sys
+import threading
+import time
+
+from carousel_deck import RENDERERS, deck_jobs, find_decks, load_deck, write_caption
+from carousel_encode import DEFAULT_PRESET, available_presets, encode, output_path
+from carousel_glyphs import ATLAS
+from carousel_layout import parse_size
+from carousel_pdf import parse_bytes
+from carousel_render import default_workers
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Full frames alive at once while one slide renders (gradient, overlays, stack, text, flatten)
+FRAMES_PER_SLIDE = 6
+
+# Resident memory of an idle worker process with the generators imported
+WORKER_BASE_BYTES = 64 * 2 ** 20
+
+# Totals of a streamed batch; peak RSS values are in bytes (workers: the largest child)
+StreamStats = namedtuple('StreamStats', 'slides bytes trims peak_rss worker_peak_rss')
+
+_libc = ctypes.CDLL(ctypes.util.find_library('c')) if ctypes.util.find_library('c') else None
+
+
+def current_rss():
+    """Resident set size of this process in bytes, or None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss(children=False):
+    """Peak resident set size in bytes of this process (or of its largest finished child)"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # Linux reports kilobytes, macOS bytes
+    return usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+
+
+def release_memory():
+    """Collect garbage and hand freed heap pages back to the OS where glibc allows it"""
+    gc.collect()
+    if _libc is not None and hasattr(_libc, 'malloc_trim'):
+        _libc.malloc_trim(0)
+
+
+def trim_caches():
+    """Empty and halve the in-memory layer and region caches of every loaded renderer and the
+    glyph atlas, then release memory
+
+    Halving makes repeated trims converge on a cache the budget can hold
+    instead of refilling and dropping it on every slide
+    """
+    for module_name in RENDERERS.values():
+        for name, limit in (('LAYER_CACHE', 'max_items'), ('REGION_CACHE', 'max_bytes')):
+            cache = getattr(sys.modules.get(module_name), name, None)
+            if cache is not None:
+                setattr(cache, limit, getattr(cache, limit) // 2)
+                cache.clear()
+    ATLAS.max_bytes //= 2
+    ATLAS.clear()
+    release_memory()
+
+
+def slide_bytes(size, supersample=1):
+    """Working-set estimate for rendering one slide"""
+    width, height = parse_size(size)
+    return width * height * supersample * supersample * 4 * FRAMES_PER_SLIDE
+
+
+def job_bytes(job, processes=True):
+    """Working-set estimate for one slide job, plus the worker process running it"""
+    size = job.kwargs.get('size', (1080, 1080))
+    return slide_bytes(size, job.kwargs.get('supersample', 1)) + (WORKER_BASE_BYTES if processes else 0)
+
+
+class MemoryBudget:
+    """Bounds renders in flight and trims caches when resident memory crosses `limit` bytes
+
+    A soft target: renders are admitted on estimates and caches trimmed after
+    the fact, so resident memory can briefly overshoot `limit`
+    """
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.trims = 0
+        self._lock = threading.Lock()
+
+    def room(self):
+        """Bytes left for renders in flight beyond this process, or None when unbounded"""
+        if not self.limit:
+            return None
+        return max(0, self.limit - (current_rss() or 0))
+
+    def check(self, limit=None):
+        """Trim caches if this process is over `limit` (default: the whole budget)"""
+        limit = limit or self.limit
+        rss = current_rss()
+        if limit and rss is not None and rss > limit:
+            with self._lock:
+                self.trims += 1
+            trim_caches()
+            return True
+        return False
+
+
+# --- Stages --------------------------------------------------------------
+
+def spec_stage(paths):
+    """Load deck specs one at a time"""
+    for path in find_decks(paths):
+        yield load_deck(path)
+
+
+def layout_stage(decks, output_root=None, sizes=None, supersample=None):
+    """Expand each deck into its slide jobs as the deck arrives"""
+    for deck in decks:
+        output_dir = os.path.join(output_root, deck['name']) if output_root else None
+        write_caption(deck, output_dir)
+        yield from deck_jobs(deck, output_dir=output_dir, sizes=sizes, supersample=supersample)
+
+
+def raster_stage(jobs):
+    """Build one slide at a time"""
+    for job in jobs:
+        yield job, job.builder(*job.args, **job.kwargs)
+
+
+def encode_stage(rasters, encoding=None):
+    """Encode each raster and close it before the next one is built"""
+    for job, img in rasters:
+        preset = encoding or job.encoding or DEFAULT_PRESET
+        data = encode(img, preset).getvalue()
+        img.close()
+        del img
+        yield job, preset, data
+
+
+def _encoded_job(job, preset, rss_limit=None):
+    """Raster and encode one job inside a worker, keeping the worker under rss_limit"""
+    img = job.builder(*job.args, **job.kwargs)
+    data = encode(img, preset).getvalue()
+    img.close()
+    del img
+    if rss_limit:
+        MemoryBudget(rss_limit).check()
+    return data
+
+
+def parallel_encode_stage(jobs, encoding=None, workers=None, executor='process', budget=None):
+    """raster_stage + encode_stage on a pool, yielding in job order with a bounded window
+
+    Only encoded bytes cross back from the workers, and a job is submitted
+    only once its estimated working set fits next to the renders already in
+    flight, so mixed sizes share the budget and a slow write never piles up
+    rasters. A job too large for the budget on its own runs alone
+    """
+    workers = workers or default_workers()
+    budget = budget or MemoryBudget()
+    processes = executor == 'process'
+    room = budget.room()
+    if room is not None and processes:
+        # No more worker processes than the budget can hold idle
+        workers = max(1, min(workers, room // WORKER_BASE_BYTES))
+
+    pool_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool_class(max_workers=workers) as pool:
+        pending = deque()
+        in_flight = 0
+        for job in jobs:
+            cost = job_bytes(job, processes)
+            while pending and (len(pending) >= workers or (room is not None and in_flight + cost > room)):
+                done, preset, future, done_cost = pending.popleft()
+                in_flight -= done_cost
+                yield done, preset, future.result()
+            preset = encoding or job.encoding or DEFAULT_PRESET
+            worker_limit = max(cost, budget.limit // workers) if budget.limit and processes else None
+            pending.append((job, preset, pool.submit(_encoded_job, job, preset, worker_limit), cost))
+            in_flight += cost
+        while pending:
+            job, preset, future, _ = pending.popleft()
+            yield job, preset, future.result()
+
+
+def write_stage(encoded):
+    """Write encoded slides atomically"""
+    for job, preset, data in encoded:
+        path = output_path(job.filename, preset)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        yield job, path, len(data)
+
+
+def stream_decks(specs, output_root=None, sizes=None, supersample=None, encoding=None, workers=1,
+                 executor='process', memory_budget=None, log=print):
+    """Render every deck through the streaming stages; returns StreamStats"""
+    budget = MemoryBudget(memory_budget)
+    jobs = layout_stage(spec_stage(specs), output_root, sizes, supersample)
+    if workers == 1:
+        encoded = encode_stage(raster_stage(jobs), encoding)
+    else:
+        encoded = parallel_encode_stage(jobs, encoding, workers, executor, budget)
+
+    slides = total = 0
+    start = time.perf_counter()
+    for job, path, size in write_stage(encoded):
+        budget.check()
+        slides += 1
+        total += size
+        rss = current_rss()
+        if log:
+            now = time.perf_counter()
+            log(f"  {(job.label or job.filename)[:55]:<55} {(now - start) * 1000:8.1f} ms "
+                f"{size / 1024:8.1f} KB  rss {(rss or 0) / 2 ** 20:6.1f} MB")
+            start = now
+    # Only pool workers count: a serial run's children are short-lived helpers like fc-match
+    pooled = workers != 1 and executor == 'process'
+    return StreamStats(slides, total, budget.trims, peak_rss(), peak_rss(children=True) if pooled else None)
+
+
+def describe(stats, seconds):
+    """One-line summary of a streamed batch"""
+    line = (f"✓ {stats.slides} slide(s), {stats.bytes / 2 ** 20:.1f} MB in {seconds:.2f}s; "
+            f"peak RSS {(stats.peak_rss or 0) / 2 ** 20:.1f} MB")
+    if stats.worker_peak_rss:
+        line += f", workers {stats.worker_peak_rss / 2 ** 20:.1f} MB"
+    if stats.trims:
+        line += f", {stats.trims} cache trim(s)"
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream deck renders one slide at a time within a memory budget")
+    parser.add_argument('specs', nargs='+', help="deck spec files or directories of specs")
+    parser.add_argument('-o', '--output-root', default=None,
+                        help="write each deck to OUTPUT_ROOT/<deck name> instead of its output_dir")
+    parser.add_argument('--sizes', default=None, help="comma-separated output sizes, e.g. square,portrait,link")
+    parser.add_argument('--supersample', type=int, default=None,
+                        help="render at N x resolution and reduce once for anti-aliasing")
+    parser.add_argument('--workers', type=int, default=1, help="parallel renders (default: 1, fully streamed)")
+    parser.add_argument('--threads', action='store_true', help="use a thread pool instead of a process pool")
+    parser.add_argument('--format', choices=available_presets(), default=None,
+                        help="output format preset (default: each deck's format, else png)")
+    parser.add_argument('--memory-budget', type=parse_bytes, default=None,
+                        help="resident memory to aim for, e.g. 512M; a soft target (default: unbounded)")
+    parser.add_argument('--quiet', action='store_true', help="only print the summary")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    stats = stream_decks(args.specs, args.output_root, args.sizes.split(',') if args.sizes else None,
+                         args.supersample, args.format, args.workers, 'thread' if args.threads else 'process',
+                         args.memory_budget, log=None if args.quiet else print)
+    print(describe(stats, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
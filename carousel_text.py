@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Text layout helpers shared by the carousel generators
+Widths come from a memoized advance-width cache, and wrapping adds word widths
+instead of re-measuring the whole line for every word. Fitted layouts are in
+design units and memoized too, so re-rendering the same copy skips the search
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+from carousel_fonts import get_font
+
+SOFT_HYPHEN = "\u00ad"
+HYPHEN = "-"
+ELLIPSIS = "…"
+
+# Result of fit_text: the chosen font and the wrapped lines (a tuple: results are shared) to draw with it
+FittedText = namedtuple('FittedText', 'font size lines line_height height')
+
+
+@lru_cache(maxsize=65536)
+def text_width(font, text):
+    """Advance width of text in font (cached per font object and string)"""
+    return font.getlength(text)
+
+
+def _split_word(word, font, room):
+    """Split word so the head plus a hyphen fits in `room`; returns (head, tail) or None"""
+    if SOFT_HYPHEN in word:
+        # Prefer the author's soft hyphens, longest head first
+        pieces = word.split(SOFT_HYPHEN)
+        for cut in range(len(pieces) - 1, 0, -1):
+            head = "".join(pieces[:cut])
+            if text_width(font, head + HYPHEN) <= room:
+                return head + HYPHEN, SOFT_HYPHEN.join(pieces[cut:])
+        return None
+
+    # Hard break: binary search the longest prefix that fits
+    low, high = 1, len(word) - 1
+    best = 0
+    while low <= high:
+        mid = (low + high) // 2
+        if text_width(font, word[:mid] + HYPHEN) <= room:
+            best, low = mid, mid + 1
+        else:
+            high = mid - 1
+    if best < 2:
+        return None
+    return word[:best] + HYPHEN, word[best:]
+
+
+def _ellipsize(line, font, max_width, ellipsis):
+    """Trim words (then characters) from the end of line until line + ellipsis fits"""
+    words = line.split()
+    while words:
+        candidate = " ".join(words) + ellipsis
+        if text_width(font, candidate) <= max_width:
+            return candidate
+        if len(words) == 1:
+            words[0] = words[0][:-1]
+            if not words[0]:
+                break
+        else:
+            words.pop()
+    return ellipsis
+
+
+def wrap_text(text, font, max_width, max_lines=None, ellipsis=ELLIPSIS, hyphenate=False):
+    """Wrap text to fit within max_width"""
+    space = text_width(font, " ")
+    words = text.split()[::-1]
+    lines = []
+    current = []
+    current_width = 0
+
+    while words:
+        word = words.pop()
+        clean = word.replace(SOFT_HYPHEN, "")
+        width = text_width(font, clean)
+        needed = width + (space if current else 0)
+
+        if current_width + needed <= max_width:
+            current.append(clean)
+            current_width += needed
+            continue
+
+        # Break at soft hyphens anywhere, but hard-break only words too long for any line
+        if hyphenate and (SOFT_HYPHEN in word or width > max_width):
+            room = max_width - current_width - (space if current else 0)
+            split = _split_word(word, font, room)
+            if split:
+                head, tail = split
+                current.append(head)
+                words.append(tail)
+                lines.append(" ".join(current))
+                current, current_width = [], 0
+                continue
+            if current and width > max_width:
+                # Retry the oversized word on a fresh line with the full width available
+                lines.append(" ".join(current))
+                current, current_width = [], 0
+                words.append(word)
+                continue
+
+        if current:
+            lines.append(" ".join(current))
+        current, current_width = [clean], width
+
+    if current:
+        lines.append(" ".join(current))
+
+    if max_lines is not None and len(lines) > max_lines:
+        lines = lines[:max_lines]
+        if lines:
+            lines[-1] = _ellipsize(lines[-1].rstrip(HYPHEN), font, max_width, ellipsis)
+
+    return lines
+
+
+def _layout(text, size, max_width, face, line_spacing, max_lines, hyphenate):
+    font = get_font(size, face)
+    lines = tuple(wrap_text(text, font, max_width, max_lines=max_lines, hyphenate=hyphenate))
+    line_height = int(size * line_spacing)
+    return FittedText(font, size, lines, line_height, line_height * len(lines))
+
+
+@lru_cache(maxsize=1024)
+def fit_text(text, max_width, max_height, max_size, min_size=12, face='regular',
+             line_spacing=1.25, max_lines=None, hyphenate=False):
+    """Wrap text at the largest font size (binary search) whose lines fit the box
+
+    Memoized per text and box; results are shared, so treat them as read-only
+    """
+    best = None
+    low, high = min_size, max_size
+    while low <= high:
+        size = (low + high) // 2
+        # Wrap without a line cap: a size only fits if the copy fits whole, never ellipsized
+        fitted = _layout(text, size, max_width, face, line_spacing, None, hyphenate)
+        widest = max((text_width(fitted.font, line) for line in fitted.lines), default=0)
+        lines_fit = max_lines is None or len(fitted.lines) <= max_lines
+        if lines_fit and fitted.height <= max_height and widest <= max_width:
+            best, low = fitted, size + 1
+        else:
+            high = size - 1
+
+    if best is not None:
+        return best
+
+    # Even min_size overflows: keep as many lines as the box holds and ellipsize the rest
+    line_height = int(min_size * line_spacing)
+    room = max(1, max_height // line_height) if line_height else 1
+    if max_lines is not None:
+        room = min(room, max_lines)
+    return _layout(text, min_size, max_width, face, line_spacing, room, hyphenate)
@@ -4,8 +4,18 @@ Generate LinkedIn Carousel slides for Sagemind AI
 Creates 8 slides for "5 Signs You've Outgrown Template Solutions"
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+import argparse
 import os
+import time
+
+from carousel_assets import draw_logo, logo_width
+from carousel_deck import deck_jobs, load_deck
+from carousel_fonts import get_font
+from carousel_glyphs import ATLAS, draw_text
+from carousel_build import add_build_arguments, build_slides
+from carousel_render import add_render_arguments
+from carousel_text import fit_text
 
 # Sagemind Brand Colors
 DARK_NAVY = "#02222e"
@@ -15,13 +25,22 @@ DARK_TEAL = "#014f4f"
 WHITE = "#ffffff"
 LIGHT_GRAY = "#f5f5f5"
 
+# Wordmark set beside the logo mark
+LOGO_TEXT = "SAGEMIND AI"
+
 # Slide dimensions
 WIDTH = 1080
 HEIGHT = 1080
 
+# Slide copy, layouts and styles for the deck
+DECK_SPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "decks", "five_signs_v1.json")
+
 # Output directory
 OUTPUT_DIR = "carousel_slides"
 
+# Bump when a builder's output changes for the same inputs, so cached slides re-render
+RENDER_VERSION = 3
+
 
 def hex_to_rgb(hex_color):
     """Convert hex color to RGB tuple"""
@@ -29,75 +48,39 @@ def hex_to_rgb(hex_color):
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
 
-def wrap_text(text, font, max_width, draw):
-    """Wrap text to fit within max_width"""
-    words = text.split()
-    lines = []
-    current_line = []
-
-    for word in words:
-        test_line = ' '.join(current_line + [word])
-        bbox = draw.textbbox((0, 0), test_line, font=font)
-        width = bbox[2] - bbox[0]
-
-        if width <= max_width:
-            current_line.append(word)
-        else:
-            if current_line:
-                lines.append(' '.join(current_line))
-            current_line = [word]
-
-    if current_line:
-        lines.append(' '.join(current_line))
-
-    return lines
-
-
-def create_slide_1():
+def create_slide_1(title_lines, subtitle, swipe):
     """Cover Slide"""
     img = Image.new('RGB', (WIDTH, HEIGHT), hex_to_rgb(DARK_NAVY))
     draw = ImageDraw.Draw(img)
 
-    # Try to use system fonts, fall back to default
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 80)
-        subtitle_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 45)
-        small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 35)
-    except:
-        title_font = ImageFont.load_default()
-        subtitle_font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
+    title_font = get_font(80)
+    subtitle_font = get_font(45)
+    small_font = get_font(35)
 
     # Main title
-    title_lines = ["5 Signs You've", "Outgrown", "Template Solutions"]
     y_pos = 280
     for line in title_lines:
-        bbox = draw.textbbox((0, 0), line, font=title_font)
+        bbox = ATLAS.bbox(title_font, line)
         text_width = bbox[2] - bbox[0]
         x_pos = (WIDTH - text_width) // 2
-        draw.text((x_pos, y_pos), line, fill=hex_to_rgb(WHITE), font=title_font)
+        draw_text(img, (x_pos, y_pos), line, hex_to_rgb(WHITE), title_font)
         y_pos += 90
 
     # Subtitle
-    subtitle = "Is your software holding your business back?"
-    bbox = draw.textbbox((0, 0), subtitle, font=subtitle_font)
+    bbox = ATLAS.bbox(subtitle_font, subtitle)
     text_width = bbox[2] - bbox[0]
     x_pos = (WIDTH - text_width) // 2
-    draw.text((x_pos, 650), subtitle, fill=hex_to_rgb(BRIGHT_CYAN), font=subtitle_font)
+    draw_text(img, (x_pos, 650), subtitle, hex_to_rgb(BRIGHT_CYAN), subtitle_font)
 
     # Bottom text
-    swipe = "Swipe to find out →"
-    bbox = draw.textbbox((0, 0), swipe, font=small_font)
+    bbox = ATLAS.bbox(small_font, swipe)
     text_width = bbox[2] - bbox[0]
     x_pos = (WIDTH - text_width) // 2
-    draw.text((x_pos, 920), swipe, fill=hex_to_rgb(BRIGHT_CYAN), font=small_font)
+    draw_text(img, (x_pos, 920), swipe, hex_to_rgb(BRIGHT_CYAN), small_font)
 
-    # Logo text
-    logo_text = "SAGEMIND AI"
-    bbox = draw.textbbox((0, 0), logo_text, font=small_font)
-    text_width = bbox[2] - bbox[0]
-    x_pos = (WIDTH - text_width) // 2
-    draw.text((x_pos, 980), logo_text, fill=hex_to_rgb(BRIGHT_CYAN), font=small_font)
+    # Logo
+    x_pos = (WIDTH - logo_width(draw, LOGO_TEXT, small_font, 56)) // 2
+    draw_logo(img, draw, (x_pos, 980), LOGO_TEXT, small_font, hex_to_rgb(BRIGHT_CYAN), 56)
 
     return img
 
@@ -107,219 +90,125 @@ def create_sign_slide(number, headline, body, bg_color, accent_color, number_col
     img = Image.new('RGB', (WIDTH, HEIGHT), hex_to_rgb(bg_color))
     draw = ImageDraw.Draw(img)
 
-    try:
-        number_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 200)
-        headline_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-        body_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 38)
-        logo_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 28)
-    except:
-        number_font = ImageFont.load_default()
-        headline_font = ImageFont.load_default()
-        body_font = ImageFont.load_default()
-        logo_font = ImageFont.load_default()
+    number_font = get_font(200)
+    logo_font = get_font(28)
 
     # Number
-    draw.text((80, 80), str(number), fill=hex_to_rgb(number_color), font=number_font)
+    draw_text(img, (80, 80), str(number), hex_to_rgb(number_color), number_font)
 
-    # Headline - wrap text
-    headline_lines = wrap_text(headline, headline_font, WIDTH - 160, draw)
+    # Headline - wrap text, shrinking to at most three lines
+    headline = fit_text(headline, WIDTH - 160, 3 * 75, 60, min_size=32, line_spacing=1.25)
     y_pos = 350
-    for line in headline_lines:
-        draw.text((80, y_pos), line, fill=hex_to_rgb(accent_color), font=headline_font)
-        y_pos += 75
+    for line in headline.lines:
+        draw_text(img, (80, y_pos), line, hex_to_rgb(accent_color), headline.font)
+        y_pos += headline.line_height
 
-    # Body text - wrap text
-    body_lines = wrap_text(body, body_font, WIDTH - 160, draw)
+    # Body text - wrap text, shrinking to stay clear of the logo
     y_pos += 40
-    for line in body_lines:
-        draw.text((80, y_pos), line, fill=hex_to_rgb(accent_color), font=body_font)
-        y_pos += 50
+    body = fit_text(body, WIDTH - 160, 950 - y_pos, 38, min_size=20, line_spacing=4/3)
+    for line in body.lines:
+        draw_text(img, (80, y_pos), line, hex_to_rgb(accent_color), body.font)
+        y_pos += body.line_height
 
     # Logo
-    draw.text((80, 980), "SAGEMIND AI", fill=hex_to_rgb(accent_color), font=logo_font)
+    draw_logo(img, draw, (80, 980), LOGO_TEXT, logo_font, hex_to_rgb(accent_color), 52)
 
     return img
 
 
-def create_solution_slide():
+def create_solution_slide(headline_lines, bullets, tagline):
     """Slide 7 - The Solution"""
     img = Image.new('RGB', (WIDTH, HEIGHT), hex_to_rgb(DARK_NAVY))
     draw = ImageDraw.Draw(img)
 
-    try:
-        headline_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 65)
-        body_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 38)
-        logo_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 30)
-    except:
-        headline_font = ImageFont.load_default()
-        body_font = ImageFont.load_default()
-        logo_font = ImageFont.load_default()
+    headline_font = get_font(65)
+    body_font = get_font(38)
+    logo_font = get_font(30)
 
     # Headline
-    headline_lines = ["Custom Doesn't", "Mean Complicated"]
     y_pos = 120
     for line in headline_lines:
-        draw.text((80, y_pos), line, fill=hex_to_rgb(WHITE), font=headline_font)
+        draw_text(img, (80, y_pos), line, hex_to_rgb(WHITE), headline_font)
         y_pos += 80
 
     # Bullet points
-    bullets = [
-        "✓ Built for YOUR exact workflow",
-        "✓ No paying for features you won't use",
-        "✓ Seamless integrations with existing tools",
-        "✓ Scales with your business, not against it"
-    ]
-
     y_pos = 380
     for bullet in bullets:
-        draw.text((80, y_pos), bullet, fill=hex_to_rgb(BRIGHT_CYAN), font=body_font)
+        draw_text(img, (80, y_pos), bullet, hex_to_rgb(BRIGHT_CYAN), body_font)
         y_pos += 90
 
     # Bottom text
-    tagline = "Built exactly how you need it."
-    draw.text((80, 860), tagline, fill=hex_to_rgb(BRIGHT_CYAN), font=logo_font)
+    draw_text(img, (80, 860), tagline, hex_to_rgb(BRIGHT_CYAN), logo_font)
 
     # Logo
-    draw.text((80, 980), "SAGEMIND AI", fill=hex_to_rgb(BRIGHT_CYAN), font=logo_font)
+    draw_logo(img, draw, (80, 980), LOGO_TEXT, logo_font, hex_to_rgb(BRIGHT_CYAN), 52)
 
     return img
 
 
-def create_cta_slide():
+def create_cta_slide(headline_lines, body_lines, url_text, tagline):
     """Slide 8 - Call to Action"""
     img = Image.new('RGB', (WIDTH, HEIGHT), hex_to_rgb(BRIGHT_CYAN))
     draw = ImageDraw.Draw(img)
 
-    try:
-        headline_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 62)
-        body_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 36)
-        url_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 50)
-        logo_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 30)
-    except:
-        headline_font = ImageFont.load_default()
-        body_font = ImageFont.load_default()
-        url_font = ImageFont.load_default()
-        logo_font = ImageFont.load_default()
+    headline_font = get_font(62)
+    body_font = get_font(36)
+    url_font = get_font(50)
+    logo_font = get_font(30)
 
     # Headline
-    headline_lines = ["Ready to Build", "What You", "Actually Need?"]
     y_pos = 140
     for line in headline_lines:
-        draw.text((80, y_pos), line, fill=hex_to_rgb(DARK_NAVY), font=headline_font)
+        draw_text(img, (80, y_pos), line, hex_to_rgb(DARK_NAVY), headline_font)
         y_pos += 75
 
     # Body
-    body_lines = [
-        "Custom websites + Google Workspace",
-        "solutions designed for small businesses,",
-        "startups, and growing teams."
-    ]
     y_pos += 40
     for line in body_lines:
-        draw.text((80, y_pos), line, fill=hex_to_rgb(DARK_NAVY), font=body_font)
+        draw_text(img, (80, y_pos), line, hex_to_rgb(DARK_NAVY), body_font)
         y_pos += 50
 
     # URL box
     draw.rectangle([(80, 700), (WIDTH - 80, 800)], fill=hex_to_rgb(DARK_NAVY))
-    url_text = "sagemindai.io"
-    bbox = draw.textbbox((0, 0), url_text, font=url_font)
+    bbox = ATLAS.bbox(url_font, url_text)
     text_width = bbox[2] - bbox[0]
     x_pos = (WIDTH - text_width) // 2
-    draw.text((x_pos, 720), url_text, fill=hex_to_rgb(BRIGHT_CYAN), font=url_font)
+    draw_text(img, (x_pos, 720), url_text, hex_to_rgb(BRIGHT_CYAN), url_font)
 
     # Bottom tagline
-    tagline = "SAGEMIND AI | Bay Area Software Consulting"
-    bbox = draw.textbbox((0, 0), tagline, font=logo_font)
+    bbox = ATLAS.bbox(logo_font, tagline)
     text_width = bbox[2] - bbox[0]
     x_pos = (WIDTH - text_width) // 2
-    draw.text((x_pos, 980), tagline, fill=hex_to_rgb(DARK_NAVY), font=logo_font)
+    draw_text(img, (x_pos, 980), tagline, hex_to_rgb(DARK_NAVY), logo_font)
 
     return img
 
 
-def main():
+# Deck spec layout name -> slide builder
+LAYOUTS = {
+    'cover': create_slide_1,
+    'sign': create_sign_slide,
+    'solution': create_solution_slide,
+    'cta': create_cta_slide,
+}
+
+
+def main(argv=None):
     """Generate all slides"""
-    # Create output directory
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    parser = add_render_arguments(argparse.ArgumentParser(description=__doc__))
+    add_build_arguments(parser)
+    args = parser.parse_args(argv)
 
     print("Generating carousel slides...")
 
-    # Slide 1 - Cover
-    print("Creating slide 1: Cover")
-    slide1 = create_slide_1()
-    slide1.save(f"{OUTPUT_DIR}/slide_01_cover.png", quality=95)
-
-    # Slide 2 - Sign #1
-    print("Creating slide 2: Sign #1")
-    slide2 = create_sign_slide(
-        1,
-        "You're Building Workarounds for Workarounds",
-        "Your team spends more time finding ways around your software's limitations than actually using it.",
-        WHITE,
-        DARK_NAVY,
-        BRIGHT_CYAN
-    )
-    slide2.save(f"{OUTPUT_DIR}/slide_02_sign1.png", quality=95)
-
-    # Slide 3 - Sign #2
-    print("Creating slide 3: Sign #2")
-    slide3 = create_sign_slide(
-        2,
-        "You're Paying for 80% You Don't Use",
-        "Template platforms charge for every feature—even the ones that don't fit your workflow.",
-        LIGHT_GRAY,
-        DARK_NAVY,
-        DARK_NAVY
-    )
-    slide3.save(f"{OUTPUT_DIR}/slide_03_sign2.png", quality=95)
-
-    # Slide 4 - Sign #3
-    print("Creating slide 4: Sign #3")
-    slide4 = create_sign_slide(
-        3,
-        "Custom Requests Get a 'No' or '$$$'",
-        "Every unique need hits a wall: 'Not possible' or expensive custom development on top of your subscription.",
-        DARK_NAVY,
-        WHITE,
-        WHITE
-    )
-    slide4.save(f"{OUTPUT_DIR}/slide_04_sign3.png", quality=95)
-
-    # Slide 5 - Sign #4
-    print("Creating slide 5: Sign #4")
-    slide5 = create_sign_slide(
-        4,
-        "Integration Hell",
-        "Your Google Workspace, CRM, and website don't talk to each other—so you're copying data manually.",
-        WHITE,
-        DARK_NAVY,
-        BRIGHT_CYAN
-    )
-    slide5.save(f"{OUTPUT_DIR}/slide_05_sign4.png", quality=95)
-
-    # Slide 6 - Sign #5
-    print("Creating slide 6: Sign #5")
-    slide6 = create_sign_slide(
-        5,
-        "Scaling Means Starting Over",
-        "Your template solution can't grow with you. Hitting a growth wall means rebuilding from scratch.",
-        DARK_NAVY,
-        WHITE,
-        BRIGHT_CYAN
-    )
-    slide6.save(f"{OUTPUT_DIR}/slide_06_sign5.png", quality=95)
-
-    # Slide 7 - Solution
-    print("Creating slide 7: Solution")
-    slide7 = create_solution_slide()
-    slide7.save(f"{OUTPUT_DIR}/slide_07_solution.png", quality=95)
-
-    # Slide 8 - CTA
-    print("Creating slide 8: Call to Action")
-    slide8 = create_cta_slide()
-    slide8.save(f"{OUTPUT_DIR}/slide_08_cta.png", quality=95)
-
-    print(f"\n✓ All slides generated successfully!")
+    jobs = deck_jobs(load_deck(DECK_SPEC), LAYOUTS, OUTPUT_DIR)
+
+    start = time.perf_counter()
+    build_slides(jobs, workers=args.workers, executor='thread' if args.threads else 'process',
+                 encoding=args.format, force=args.force)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n✓ All slides generated successfully in {elapsed:.2f}s!")
     print(f"✓ Saved to: {os.path.abspath(OUTPUT_DIR)}")
     print("\nNext steps:")
     print("1. Review the slides in the carousel_slides folder")
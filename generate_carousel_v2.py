@@ -4,10 +4,28 @@ Generate LinkedIn Carousel slides for Sagemind AI - V2 Enhanced
 Advanced tech-focused design with gradients, patterns, and AI-inspired visuals
 """
 
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image, ImageChops, ImageDraw, ImageFilter
+from collections import namedtuple
+import argparse
 import os
-import math
-import random
+import time
+
+from carousel_assets import draw_logo, logo_width
+from carousel_cache import LayerCache
+from carousel_gradients import linear_gradient
+from carousel_layers import LayerStack, new_frame, track
+from carousel_layout import SIZES, Canvas
+from carousel_patterns import (circuit_layer, geometric_layer, neural_network_frame, neural_network_layer,
+                               pattern_field, scaled_circuit_traces)
+from carousel_deck import deck_jobs, load_deck
+from carousel_effects import draw_glow_text
+from carousel_fonts import get_font
+from carousel_glyphs import ATLAS, draw_text
+from carousel_regions import RegionCache
+from carousel_profile import PROFILER, add_profile_arguments, profiled, stage
+from carousel_build import add_build_arguments, build_slides
+from carousel_render import add_render_arguments
+from carousel_text import fit_text
 
 # Sagemind Brand Colors
 DARK_NAVY = (2, 34, 46)
@@ -17,461 +35,588 @@ DARK_TEAL = (1, 79, 79)
 WHITE = (255, 255, 255)
 LIGHT_GRAY = (245, 245, 245)
 
+# Wordmark set beside the logo mark
+LOGO_TEXT = "SAGEMIND AI"
+
 # Slide dimensions
 WIDTH = 1080
 HEIGHT = 1080
 
+# Open Graph cards are designed directly in link-share units
+OG_SIZE = SIZES['link']
+
+# Slide copy, layouts and styles for the deck
+DECK_SPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "decks", "five_signs_v2.json")
+
 # Output directory
 OUTPUT_DIR = "carousel_slides_v2"
 
+# Bump when a builder's output changes for the same inputs, so cached slides re-render
+RENDER_VERSION = 6
+
+# Fixed seeds keep every pattern overlay deterministic (and therefore cacheable)
+CIRCUIT_SEED = 42
+GEOMETRIC_SEED = 123
+NEURAL_SEED = 789
+
+# Shared cache of rendered backgrounds
+LAYER_CACHE = LayerCache()
 
+
+@profiled('gradient')
 def create_gradient_background(width, height, color1, color2, vertical=True):
     """Create a gradient background"""
-    base = Image.new('RGB', (width, height), color1)
-    gradient = Image.new('RGB', (width, height), color1)
-    draw = ImageDraw.Draw(gradient)
-
-    if vertical:
-        for i in range(height):
-            r = int(color1[0] + (color2[0] - color1[0]) * i / height)
-            g = int(color1[1] + (color2[1] - color1[1]) * i / height)
-            b = int(color1[2] + (color2[2] - color1[2]) * i / height)
-            draw.line([(0, i), (width, i)], fill=(r, g, b))
-    else:
-        for i in range(width):
-            r = int(color1[0] + (color2[0] - color1[0]) * i / width)
-            g = int(color1[1] + (color2[1] - color1[1]) * i / width)
-            b = int(color1[2] + (color2[2] - color1[2]) * i / width)
-            draw.line([(i, 0), (i, height)], fill=(r, g, b))
-
-    return gradient
-
-
-def add_circuit_pattern(img, color, opacity=30):
-    """Add circuit board pattern overlay"""
-    overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
+    direction = 'vertical' if vertical else 'horizontal'
+    return linear_gradient((width, height), [color1, color2], direction)
+
+
+@profiled()
+def circuit_overlay(size, color, opacity=30, seed=CIRCUIT_SEED, tile=None):
+    """Circuit board pattern as a transparent RGBA layer"""
+    return track(circuit_layer(size, color, opacity=opacity, seed=seed, design_size=(WIDTH, HEIGHT), tile=tile),
+                 'overlay')
 
-    # Draw circuit-like lines and nodes
-    random.seed(42)  # Consistent pattern
-    for _ in range(15):
-        x1, y1 = random.randint(0, WIDTH), random.randint(0, HEIGHT)
-        x2, y2 = x1 + random.randint(-200, 200), y1 + random.randint(-200, 200)
-        draw.line([(x1, y1), (x2, y2)], fill=(*color, opacity), width=2)
-        draw.ellipse([(x1-5, y1-5), (x1+5, y1+5)], fill=(*color, opacity))
-        draw.ellipse([(x2-5, y2-5), (x2+5, y2+5)], fill=(*color, opacity))
 
-    # Convert to RGB and composite
-    img_rgba = img.convert('RGBA')
-    img_rgba = Image.alpha_composite(img_rgba, overlay)
-    return img_rgba.convert('RGB')
+@profiled()
+def geometric_overlay(size, color, opacity=40, seed=GEOMETRIC_SEED, tile=None):
+    """Hexagon outlines as a transparent RGBA layer"""
+    return track(geometric_layer(size, color, opacity=opacity, seed=seed, design_size=(WIDTH, HEIGHT), tile=tile),
+                 'overlay')
 
 
-def add_geometric_shapes(img, color, opacity=40):
+@profiled()
+def neural_network_overlay(size, color, opacity=50, seed=NEURAL_SEED, nodes=12, radius=250,
+                           mode='radius', k=3):
+    """AI/neural network inspired pattern as a transparent RGBA layer"""
+    return track(neural_network_layer(size, color, opacity=opacity, seed=seed, nodes=nodes,
+                                      radius=radius, mode=mode, k=k, design_size=(WIDTH, HEIGHT)),
+                 'overlay')
+
+
+def _apply_overlay(img, overlay_fn, color, opacity, seed):
+    """Composite one overlay onto an RGB image (for callers outside a layer stack)"""
+    overlay = overlay_fn(img.size, color, opacity=opacity, seed=seed)
+    return LayerStack(img.size).add(img).add(overlay).flatten('RGB')
+
+
+def add_circuit_pattern(img, color, opacity=30, seed=CIRCUIT_SEED):
+    """Add circuit board pattern overlay"""
+    return _apply_overlay(img, circuit_overlay, color, opacity, seed)
+
+
+def add_geometric_shapes(img, color, opacity=40, seed=GEOMETRIC_SEED):
     """Add geometric shapes overlay"""
-    overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
+    return _apply_overlay(img, geometric_overlay, color, opacity, seed)
+
 
-    # Hexagons and lines
-    random.seed(123)
-    for _ in range(8):
-        x, y = random.randint(0, WIDTH), random.randint(0, HEIGHT)
-        size = random.randint(40, 80)
-        # Draw hexagon outline
-        points = []
-        for i in range(6):
-            angle = math.pi / 3 * i
-            px = x + size * math.cos(angle)
-            py = y + size * math.sin(angle)
-            points.append((px, py))
-        draw.polygon(points, outline=(*color, opacity), width=2)
-
-    img_rgba = img.convert('RGBA')
-    img_rgba = Image.alpha_composite(img_rgba, overlay)
-    return img_rgba.convert('RGB')
-
-
-def add_neural_network_pattern(img, color, opacity=50):
+def add_neural_network_pattern(img, color, opacity=50, seed=NEURAL_SEED):
     """Add AI/neural network inspired pattern"""
-    overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
+    return _apply_overlay(img, neural_network_overlay, color, opacity, seed)
+
+
+def circuit_frame(size, color, t, opacity=30, seed=CIRCUIT_SEED):
+    """One frame (t in [0, 1), looping) of the circuit pattern with signals running along the traces"""
+    overlay = new_frame('RGBA', size, (0, 0, 0, 0), kind='overlay')
     draw = ImageDraw.Draw(overlay)
+    _, s = pattern_field(size, (WIDTH, HEIGHT))
+    width = max(1, round(2 * s))
+    r = 5 * s
+
+    traces = scaled_circuit_traces(size, seed, design_size=(WIDTH, HEIGHT))
+    for index, (x1, y1, x2, y2) in enumerate(traces):
+        # Dim trace with a bright pulse travelling from one end to the other
+        draw.line([(x1, y1), (x2, y2)], fill=(*color, opacity // 2), width=width)
+        head = (t + index / len(traces)) % 1
+        tail = max(0.0, head - 0.3)
+        draw.line([(x1 + (x2 - x1) * tail, y1 + (y2 - y1) * tail),
+                   (x1 + (x2 - x1) * head, y1 + (y2 - y1) * head)],
+                  fill=(*color, min(255, opacity * 2)), width=width)
+        glow = int(opacity * (1 + max(0.0, 1 - abs(head - 1) * 10)))
+        draw.ellipse([(x1-r, y1-r), (x1+r, y1+r)], fill=(*color, opacity))
+        draw.ellipse([(x2-r, y2-r), (x2+r, y2+r)], fill=(*color, min(255, glow)))
+
+    return overlay
+
+
+def neural_network_overlay_frame(size, color, t, opacity=50, seed=NEURAL_SEED, nodes=12, radius=250,
+                                 mode='radius', k=3):
+    """One frame of the network pattern with pulsing nodes and fading edges"""
+    return track(neural_network_frame(size, color, t, opacity=opacity, seed=seed, nodes=nodes,
+                                      radius=radius, mode=mode, k=k, design_size=(WIDTH, HEIGHT)),
+                 'overlay')
+
+
+# Static overlay -> frame function taking the animation phase t as its third argument
+ANIMATED_OVERLAYS = {
+    circuit_overlay: circuit_frame,
+    neural_network_overlay: neural_network_overlay_frame,
+}
+
+
+# Fitted headline and body of a sign slide (carousel_text.FittedText without fonts)
+SignText = namedtuple('SignText', 'headline body')
+
+# A slide's background before rendering: slide_background() arguments after the canvas
+Background = namedtuple('Background', 'color1 color2 overlays vertical')
+Background.__new__.__defaults__ = ((), True)
+
+# What a builder lays out: the canvas, its Background and a text_layer(img, draw) callable
+SlideLayers = namedtuple('SlideLayers', 'canvas background text')
+
+
+@profiled()
+def slide_background(canvas, color1, color2, overlays=(), vertical=True):
+    """Gradient plus (overlay, color, opacity, seed[, options]) layers as one cached RGBA image"""
+    size = canvas.raster_size
+    overlays = [(*entry, {})[:5] for entry in overlays]
+    params = (
+        size, color1, color2, vertical,
+        tuple((overlay.__name__, color, opacity, seed, tuple(sorted(options.items())))
+              for overlay, color, opacity, seed, options in overlays),
+    )
+
+    def build():
+        stack = LayerStack(size)
+        stack.add(track(create_gradient_background(*size, color1, color2, vertical=vertical),
+                        'gradient'), name='gradient')
+        for overlay, color, opacity, seed, options in overlays:
+            stack.add(overlay(size, color, opacity=opacity, seed=seed, **options),
+                      name=overlay.__name__)
+        return stack.flatten('RGBA')
+
+    return track(LAYER_CACHE.get('background', params, build), 'cache')
+
+
+def add_glow_text(img, text, position, font, color, glow_color, radius=10, strength=1.0):
+    """Add glowing text effect (img must be RGBA)"""
+    draw_glow_text(img, position, text, font, color, glow_color, radius=radius, strength=strength)
+
+
+def centered_x(canvas, text, font):
+    """x that centers text horizontally on the canvas"""
+    bbox = ATLAS.bbox(font, text)
+    return (canvas.width - (bbox[2] - bbox[0])) // 2
+
+
+def _background(layers):
+    return slide_background(layers.canvas, *layers.background)
+
+
+def _compose(layers, background):
+    """Stack a rendered background + text and reduce to the output size"""
+    canvas, _, text_layer = layers
+    stack = LayerStack(canvas.raster_size)
+    stack.add(background, name='background', owned=True)
+    stack.add(profiled('text')(text_layer), name='text')
+    with stage('composite'):
+        return canvas.finish(stack.flatten())
+
+
+# Last render per background, so slides that share one only repaint what differs
+REGION_CACHE = RegionCache(_background, _compose)
 
-    # Create nodes
-    random.seed(789)
-    nodes = [(random.randint(100, WIDTH-100), random.randint(100, HEIGHT-100)) for _ in range(12)]
 
-    # Connect nearby nodes
-    for i, node1 in enumerate(nodes):
-        draw.ellipse([(node1[0]-6, node1[1]-6), (node1[0]+6, node1[1]+6)], fill=(*color, opacity))
-        for node2 in nodes[i+1:]:
-            distance = math.sqrt((node1[0]-node2[0])**2 + (node1[1]-node2[1])**2)
-            if distance < 250:
-                draw.line([node1, node2], fill=(*color, int(opacity*0.5)), width=1)
+def _flatten(layers):
+    """Render a slide, repainting only the changed regions of the last render on the same background"""
+    return REGION_CACHE.render(layers)
 
-    img_rgba = img.convert('RGBA')
-    img_rgba = Image.alpha_composite(img_rgba, overlay)
-    return img_rgba.convert('RGB')
 
+def _extract_layer(size, draw_layer):
+    """Recover draw_layer's colour and coverage as a transparent RGBA image
 
-def add_glow_text(draw, text, position, font, color, glow_color):
-    """Add glowing text effect"""
-    x, y = position
-    # Draw glow layers
-    for offset in range(3, 0, -1):
-        alpha = int(60 / offset)
-        draw.text((x, y), text, fill=(*glow_color, alpha), font=font)
-    # Draw main text
-    draw.text((x, y), text, fill=color, font=font)
+    Drawing onto opaque black and opaque white and differencing the two gives
+    each pixel's alpha exactly, so the layer composites like it was drawn in place
+    """
+    black = new_frame('RGBA', size, (0, 0, 0, 255), kind='animation')
+    white = new_frame('RGBA', size, (255, 255, 255, 255), kind='animation')
+    for img in (black, white):
+        draw_layer(img, ImageDraw.Draw(img))
+    spread = ImageChops.subtract(white.convert('RGB'), black.convert('RGB'))
+    r, g, b = spread.split()
+    alpha = ImageChops.invert(ImageChops.lighter(ImageChops.lighter(r, g), b))
+    # Over black the colour channels are already premultiplied by alpha
+    return Image.merge('RGBa', (*black.convert('RGB').split(), alpha)).convert('RGBA')
 
 
-def wrap_text(text, font, max_width, draw):
-    """Wrap text to fit within max_width"""
-    words = text.split()
-    lines = []
-    current_line = []
+def animation_frames(layers, count=48):
+    """Yield `count` RGB frames of a looping animation of a slide's patterns
 
-    for word in words:
-        test_line = ' '.join(current_line + [word])
-        bbox = draw.textbbox((0, 0), test_line, font=font)
-        width = bbox[2] - bbox[0]
+    The gradient, static overlays and text render once; each frame copies that
+    base and redraws only the animated overlays
+    """
+    canvas, background, text_layer = layers
+    overlays = [(*entry, {})[:5] for entry in background.overlays]
+    static = [entry for entry in overlays if entry[0] not in ANIMATED_OVERLAYS]
+    moving = [entry for entry in overlays if entry[0] in ANIMATED_OVERLAYS]
 
-        if width <= max_width:
-            current_line.append(word)
-        else:
-            if current_line:
-                lines.append(' '.join(current_line))
-            current_line = [word]
+    base = slide_background(canvas, background.color1, background.color2, static, background.vertical)
+    text = _extract_layer(canvas.raster_size, text_layer)
+    for index in range(count):
+        t = index / count
+        with stage('frame'):
+            frame = base.copy()
+            for overlay, color, opacity, seed, options in moving:
+                frame.alpha_composite(ANIMATED_OVERLAYS[overlay](canvas.raster_size, color, t, opacity=opacity,
+                                                                 seed=seed, **options))
+            frame.alpha_composite(text)
+            yield canvas.finish(frame.convert('RGB'))
 
-    if current_line:
-        lines.append(' '.join(current_line))
 
-    return lines
+def slide_1_layers(title_lines, subtitle, swipe, size=(WIDTH, HEIGHT), supersample=1):
+    """Cover slide layers: background spec and text drawing, before flattening"""
+    c = Canvas(size, supersample)
 
+    # Gradient background with tech patterns
+    background = Background(DARK_NAVY, DARK_TEAL, [
+        (circuit_overlay, BRIGHT_CYAN, 40, CIRCUIT_SEED),
+        (neural_network_overlay, BRIGHT_CYAN, 60, NEURAL_SEED),
+    ])
 
-def create_slide_1_v2():
+    # Text and glow effects, drawn into the stack's RGBA buffer
+    def text_layer(img_rgba, draw):
+        title_font = get_font(c.px(85))
+        subtitle_font = get_font(c.px(42))
+        small_font = get_font(c.px(36))
+
+        # Main title with spacing
+        y_pos = c.y(250)
+        for line in title_lines:
+            x_pos = centered_x(c, line, title_font)
+
+            # Add glow effect
+            add_glow_text(img_rgba, line, (x_pos, y_pos), title_font, WHITE, BRIGHT_CYAN,
+                          radius=c.px(14), strength=0.8)
+            y_pos += c.px(95)
+
+        # Subtitle with glow
+        x_pos = centered_x(c, subtitle, subtitle_font)
+        add_glow_text(img_rgba, subtitle, (x_pos, c.y(660)), subtitle_font, BRIGHT_CYAN, BRIGHT_CYAN,
+                      radius=c.px(8), strength=0.6)
+
+        # Add decorative line
+        draw.line([(c.width//2 - c.px(100), c.y(620)), (c.width//2 + c.px(100), c.y(620))],
+                  fill=BRIGHT_CYAN, width=c.px(3))
+
+        # Bottom text
+        x_pos = centered_x(c, swipe, small_font)
+        draw_text(img_rgba, (x_pos, c.y(880)), swipe, BRIGHT_CYAN, small_font)
+
+        # Logo
+        x_pos = (c.width - logo_width(draw, LOGO_TEXT, small_font, c.px(64))) // 2
+        draw_logo(img_rgba, draw, (x_pos, c.y(950)), LOGO_TEXT, small_font, BRIGHT_CYAN, c.px(64))
+
+    return SlideLayers(c, background, text_layer)
+
+
+@profiled()
+def create_slide_1_v2(title_lines, subtitle, swipe, size=(WIDTH, HEIGHT), supersample=1):
     """Enhanced Cover Slide with tech elements"""
-    # Gradient background
-    img = create_gradient_background(WIDTH, HEIGHT, DARK_NAVY, DARK_TEAL)
+    return _flatten(slide_1_layers(title_lines, subtitle, swipe, size, supersample))
 
-    # Add tech patterns
-    img = add_circuit_pattern(img, BRIGHT_CYAN, opacity=40)
-    img = add_neural_network_pattern(img, BRIGHT_CYAN, opacity=60)
 
-    # Convert to RGBA for text with glow
-    img_rgba = img.convert('RGBA')
-    draw = ImageDraw.Draw(img_rgba)
+def sign_text_layout(headline, body, **_):
+    """Headline and body of a sign slide fitted in design units, the same for every output size
+
+    Fonts are looked up per raster size when drawing, so the layout carries
+    none and can be handed to any worker
+    """
+    text_width = WIDTH - 2 * 80
+    head = fit_text(headline, text_width, 3 * 72, 58, min_size=32, line_spacing=1.25)
+    body_top = 350 + head.height + 30
+    text = fit_text(body, text_width, 940 - body_top, 36, min_size=20, line_spacing=4/3)
+    return SignText(head._replace(font=None), text._replace(font=None))
+
+
+def sign_slide_layers(number, headline, body, style='dark', size=(WIDTH, HEIGHT), supersample=1, text_layout=None):
+    """Sign slide layers: background spec and text drawing, before flattening
+
+    text_layout (from sign_text_layout) skips fitting the copy again for each size
+    """
+    c = Canvas(size, supersample)
+    text_layout = text_layout or sign_text_layout(headline, body)
 
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 85)
-        subtitle_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 42)
-        small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 36)
-    except:
-        title_font = ImageFont.load_default()
-        subtitle_font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
-
-    # Main title with spacing
-    title_lines = ["5 Signs You've", "Outgrown", "Template Solutions"]
-    y_pos = 250
-    for line in title_lines:
-        bbox = draw.textbbox((0, 0), line, font=title_font)
-        text_width = bbox[2] - bbox[0]
-        x_pos = (WIDTH - text_width) // 2
-
-        # Add glow effect
-        for offset in range(4, 0, -1):
-            draw.text((x_pos, y_pos), line, fill=(*BRIGHT_CYAN, int(30/offset)), font=title_font)
-        draw.text((x_pos, y_pos), line, fill=WHITE, font=title_font)
-        y_pos += 95
-
-    # Subtitle with glow
-    subtitle = "Is your software holding your business back?"
-    bbox = draw.textbbox((0, 0), subtitle, font=subtitle_font)
-    text_width = bbox[2] - bbox[0]
-    x_pos = (WIDTH - text_width) // 2
-
-    for offset in range(3, 0, -1):
-        draw.text((x_pos, 660), subtitle, fill=(*BRIGHT_CYAN, int(50/offset)), font=subtitle_font)
-    draw.text((x_pos, 660), subtitle, fill=BRIGHT_CYAN, font=subtitle_font)
-
-    # Add decorative line
-    draw.line([(WIDTH//2 - 100, 620), (WIDTH//2 + 100, 620)], fill=BRIGHT_CYAN, width=3)
-
-    # Bottom text
-    swipe = "Swipe to discover →"
-    bbox = draw.textbbox((0, 0), swipe, font=small_font)
-    text_width = bbox[2] - bbox[0]
-    x_pos = (WIDTH - text_width) // 2
-    draw.text((x_pos, 880), swipe, fill=BRIGHT_CYAN, font=small_font)
-
-    # Logo
-    logo_text = "SAGEMIND AI"
-    bbox = draw.textbbox((0, 0), logo_text, font=small_font)
-    text_width = bbox[2] - bbox[0]
-    x_pos = (WIDTH - text_width) // 2
-    draw.text((x_pos, 950), logo_text, fill=BRIGHT_CYAN, font=small_font)
-
-    return img_rgba.convert('RGB')
-
-
-def create_sign_slide_v2(number, headline, body, style='dark'):
-    """Enhanced sign slide with tech elements"""
     if style == 'dark':
-        img = create_gradient_background(WIDTH, HEIGHT, DARK_NAVY, DARK_TEAL)
-        img = add_geometric_shapes(img, BRIGHT_CYAN, opacity=50)
+        background = Background(DARK_NAVY, DARK_TEAL, [
+            (geometric_overlay, BRIGHT_CYAN, 50, GEOMETRIC_SEED),
+        ])
         text_color = WHITE
         accent_color = BRIGHT_CYAN
         number_color = BRIGHT_CYAN
     elif style == 'light':
-        img = create_gradient_background(WIDTH, HEIGHT, LIGHT_GRAY, WHITE)
-        img = add_circuit_pattern(img, TEAL, opacity=30)
+        background = Background(LIGHT_GRAY, WHITE, [
+            (circuit_overlay, TEAL, 30, CIRCUIT_SEED),
+        ])
         text_color = DARK_NAVY
         accent_color = DARK_NAVY
         number_color = TEAL
     else:  # cyan
         base_cyan = (int(BRIGHT_CYAN[0]*0.3), int(BRIGHT_CYAN[1]*0.3), int(BRIGHT_CYAN[2]*0.3))
-        img = create_gradient_background(WIDTH, HEIGHT, base_cyan, DARK_TEAL)
-        img = add_neural_network_pattern(img, BRIGHT_CYAN, opacity=70)
+        background = Background(base_cyan, DARK_TEAL, [
+            (neural_network_overlay, BRIGHT_CYAN, 70, NEURAL_SEED),
+        ])
         text_color = WHITE
         accent_color = BRIGHT_CYAN
         number_color = BRIGHT_CYAN
 
-    img_rgba = img.convert('RGBA')
-    draw = ImageDraw.Draw(img_rgba)
+    # Text and glow effects, drawn into the stack's RGBA buffer
+    def text_layer(img_rgba, draw):
+        number_font = get_font(c.px(180))
+        logo_font = get_font(c.px(28))
 
-    try:
-        number_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 180)
-        headline_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 58)
-        body_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 36)
-        logo_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 28)
-    except:
-        number_font = ImageFont.load_default()
-        headline_font = ImageFont.load_default()
-        body_font = ImageFont.load_default()
-        logo_font = ImageFont.load_default()
-
-    # Number with glow
-    for offset in range(5, 0, -1):
-        draw.text((70, 70), str(number), fill=(*number_color, int(40/offset)), font=number_font)
-    draw.text((70, 70), str(number), fill=number_color, font=number_font)
-
-    # Decorative element next to number
-    draw.rectangle([(50, 280), (60, 380)], fill=accent_color)
-
-    # Headline
-    headline_lines = wrap_text(headline, headline_font, WIDTH - 160, draw)
-    y_pos = 350
-    for line in headline_lines:
-        draw.text((80, y_pos), line, fill=accent_color, font=headline_font)
-        y_pos += 72
-
-    # Body text
-    body_lines = wrap_text(body, body_font, WIDTH - 160, draw)
-    y_pos += 30
-    for line in body_lines:
-        draw.text((80, y_pos), line, fill=text_color, font=body_font)
-        y_pos += 48
-
-    # Logo
-    draw.text((80, 970), "SAGEMIND AI", fill=accent_color, font=logo_font)
-
-    return img_rgba.convert('RGB')
-
-
-def create_solution_slide_v2():
+        # Number with glow
+        add_glow_text(img_rgba, str(number), (c.x(70), c.y(70)), number_font, number_color, number_color,
+                      radius=c.px(20), strength=0.6)
+
+        # Decorative element next to number
+        draw.rectangle([(c.x(50), c.y(280)), (c.x(60), c.y(380))], fill=accent_color)
+
+        # Headline, shrunk to at most three lines when the copy runs long (laid out in design units)
+        fitted = text_layout.headline
+        font = get_font(c.px(fitted.size))
+        y_pos = c.y(350)
+        for line in fitted.lines:
+            draw_text(img_rgba, (c.x(80), y_pos), line, accent_color, font)
+            y_pos += c.px(fitted.line_height)
+
+        # Body text, shrunk to stay clear of the logo
+        y_pos += c.px(30)
+        fitted = text_layout.body
+        font = get_font(c.px(fitted.size))
+        for line in fitted.lines:
+            draw_text(img_rgba, (c.x(80), y_pos), line, text_color, font)
+            y_pos += c.px(fitted.line_height)
+
+        # Logo
+        draw_logo(img_rgba, draw, (c.x(80), c.y(970)), LOGO_TEXT, logo_font, accent_color, c.px(52))
+
+    return SlideLayers(c, background, text_layer)
+
+
+@profiled()
+def create_sign_slide_v2(number, headline, body, style='dark', size=(WIDTH, HEIGHT), supersample=1,
+                         text_layout=None):
+    """Enhanced sign slide with tech elements"""
+    return _flatten(sign_slide_layers(number, headline, body, style, size, supersample, text_layout))
+
+
+def solution_slide_layers(headline_lines, bullets, tagline, size=(WIDTH, HEIGHT), supersample=1):
+    """Solution slide layers: background spec and text drawing, before flattening"""
+    c = Canvas(size, supersample)
+
+    background = Background(DARK_NAVY, DARK_TEAL, [
+        (circuit_overlay, BRIGHT_CYAN, 50, CIRCUIT_SEED),
+        (neural_network_overlay, BRIGHT_CYAN, 40, NEURAL_SEED),
+    ])
+
+    # Text and glow effects, drawn into the stack's RGBA buffer
+    def text_layer(img_rgba, draw):
+        headline_font = get_font(c.px(68))
+        body_font = get_font(c.px(36))
+        logo_font = get_font(c.px(30))
+
+        # Headline with glow
+        y_pos = c.y(120)
+        for line in headline_lines:
+            add_glow_text(img_rgba, line, (c.x(80), y_pos), headline_font, WHITE, BRIGHT_CYAN,
+                          radius=c.px(12), strength=0.7)
+            y_pos += c.px(85)
+
+        # Decorative line
+        draw.rectangle([(c.x(80), c.y(300)), (c.x(300), c.y(300) + c.px(5))], fill=BRIGHT_CYAN)
+
+        # Bullet points with icons
+        y_pos = c.y(380)
+        for bullet in bullets:
+            draw_text(img_rgba, (c.x(80), y_pos), bullet, BRIGHT_CYAN, body_font)
+            y_pos += c.px(90)
+
+        # Bottom tagline
+        draw_text(img_rgba, (c.x(80), c.y(850)), tagline, BRIGHT_CYAN, logo_font)
+
+        # Logo
+        draw_logo(img_rgba, draw, (c.x(80), c.y(970)), LOGO_TEXT, logo_font, BRIGHT_CYAN, c.px(52))
+
+    return SlideLayers(c, background, text_layer)
+
+
+@profiled()
+def create_solution_slide_v2(headline_lines, bullets, tagline, size=(WIDTH, HEIGHT), supersample=1):
     """Enhanced Solution Slide"""
-    img = create_gradient_background(WIDTH, HEIGHT, DARK_NAVY, DARK_TEAL)
-    img = add_circuit_pattern(img, BRIGHT_CYAN, opacity=50)
-    img = add_neural_network_pattern(img, BRIGHT_CYAN, opacity=40)
+    return _flatten(solution_slide_layers(headline_lines, bullets, tagline, size, supersample))
 
-    img_rgba = img.convert('RGBA')
-    draw = ImageDraw.Draw(img_rgba)
 
-    try:
-        headline_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 68)
-        body_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 36)
-        logo_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 30)
-    except:
-        headline_font = ImageFont.load_default()
-        body_font = ImageFont.load_default()
-        logo_font = ImageFont.load_default()
-
-    # Headline with glow
-    headline_lines = ["Custom Doesn't", "Mean Complicated"]
-    y_pos = 120
-    for line in headline_lines:
-        for offset in range(3, 0, -1):
-            draw.text((80, y_pos), line, fill=(*BRIGHT_CYAN, int(40/offset)), font=headline_font)
-        draw.text((80, y_pos), line, fill=WHITE, font=headline_font)
-        y_pos += 85
-
-    # Decorative line
-    draw.rectangle([(80, 300), (300, 305)], fill=BRIGHT_CYAN)
-
-    # Bullet points with icons
-    bullets = [
-        "✓  Built for YOUR exact workflow",
-        "✓  No paying for features you won't use",
-        "✓  Seamless integrations with existing tools",
-        "✓  Scales with your business, not against it"
-    ]
-
-    y_pos = 380
-    for bullet in bullets:
-        # Draw bullet glow
-        draw.text((80, y_pos), bullet, fill=BRIGHT_CYAN, font=body_font)
-        y_pos += 90
-
-    # Bottom tagline
-    tagline = "Built exactly how you need it."
-    draw.text((80, 850), tagline, fill=BRIGHT_CYAN, font=logo_font)
-
-    # Logo
-    draw.text((80, 970), "SAGEMIND AI", fill=BRIGHT_CYAN, font=logo_font)
-
-    return img_rgba.convert('RGB')
-
-
-def create_cta_slide_v2():
-    """Enhanced CTA Slide"""
+def cta_slide_layers(headline_lines, body_lines, url_text, tagline, size=(WIDTH, HEIGHT), supersample=1):
+    """CTA slide layers: background spec and text drawing, before flattening"""
+    c = Canvas(size, supersample)
+
     # Vibrant gradient
     base_color = (int(BRIGHT_CYAN[0]*0.9), int(BRIGHT_CYAN[1]*0.9), int(BRIGHT_CYAN[2]*0.9))
-    img = create_gradient_background(WIDTH, HEIGHT, base_color, BRIGHT_CYAN, vertical=False)
-    img = add_geometric_shapes(img, DARK_NAVY, opacity=60)
-
-    img_rgba = img.convert('RGBA')
-    draw = ImageDraw.Draw(img_rgba)
-
-    try:
-        headline_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 64)
-        body_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 34)
-        url_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 52)
-        logo_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 28)
-    except:
-        headline_font = ImageFont.load_default()
-        body_font = ImageFont.load_default()
-        url_font = ImageFont.load_default()
-        logo_font = ImageFont.load_default()
-
-    # Headline
-    headline_lines = ["Ready to Build", "What You", "Actually Need?"]
-    y_pos = 140
-    for line in headline_lines:
-        draw.text((80, y_pos), line, fill=DARK_NAVY, font=headline_font)
-        y_pos += 78
-
-    # Decorative element
-    draw.rectangle([(80, 420), (200, 425)], fill=DARK_NAVY)
-
-    # Body
-    body_lines = [
-        "Custom websites + Google Workspace solutions",
-        "designed for small businesses, startups,",
-        "and growing teams."
-    ]
-    y_pos = 460
-    for line in body_lines:
-        draw.text((80, y_pos), line, fill=DARK_NAVY, font=body_font)
-        y_pos += 48
-
-    # URL box with shadow
-    draw.rectangle([(70, 690), (WIDTH - 70, 810)], fill=DARK_NAVY)
-    draw.rectangle([(80, 700), (WIDTH - 80, 800)], fill=DARK_NAVY)
-
-    url_text = "sagemindai.io"
-    bbox = draw.textbbox((0, 0), url_text, font=url_font)
-    text_width = bbox[2] - bbox[0]
-    x_pos = (WIDTH - text_width) // 2
-
-    # URL with glow
-    for offset in range(3, 0, -1):
-        draw.text((x_pos, 725), url_text, fill=(*BRIGHT_CYAN, int(50/offset)), font=url_font)
-    draw.text((x_pos, 725), url_text, fill=BRIGHT_CYAN, font=url_font)
-
-    # Bottom tagline
-    tagline = "SAGEMIND AI  |  Bay Area Software Consulting"
-    bbox = draw.textbbox((0, 0), tagline, font=logo_font)
-    text_width = bbox[2] - bbox[0]
-    x_pos = (WIDTH - text_width) // 2
-    draw.text((x_pos, 960), tagline, fill=DARK_NAVY, font=logo_font)
-
-    return img_rgba.convert('RGB')
-
-
-def main():
+    background = Background(base_color, BRIGHT_CYAN, [
+        (geometric_overlay, DARK_NAVY, 60, GEOMETRIC_SEED),
+    ], vertical=False)
+
+    # Text and glow effects, drawn into the stack's RGBA buffer
+    def text_layer(img_rgba, draw):
+        headline_font = get_font(c.px(64))
+        body_font = get_font(c.px(34))
+        url_font = get_font(c.px(52))
+        logo_font = get_font(c.px(28))
+
+        # Headline
+        y_pos = c.y(140)
+        for line in headline_lines:
+            draw_text(img_rgba, (c.x(80), y_pos), line, DARK_NAVY, headline_font)
+            y_pos += c.px(78)
+
+        # Decorative element
+        draw.rectangle([(c.x(80), c.y(420)), (c.x(200), c.y(420) + c.px(5))], fill=DARK_NAVY)
+
+        # Body
+        y_pos = c.y(460)
+        for line in body_lines:
+            draw_text(img_rgba, (c.x(80), y_pos), line, DARK_NAVY, body_font)
+            y_pos += c.px(48)
+
+        # URL box with shadow
+        draw.rectangle([(c.x(70), c.y(690)), (c.right(70), c.y(810))], fill=DARK_NAVY)
+        draw.rectangle([(c.x(80), c.y(700)), (c.right(80), c.y(800))], fill=DARK_NAVY)
+
+        # URL with glow
+        x_pos = centered_x(c, url_text, url_font)
+        add_glow_text(img_rgba, url_text, (x_pos, c.y(725)), url_font, BRIGHT_CYAN, BRIGHT_CYAN,
+                      radius=c.px(10), strength=0.8)
+
+        # Bottom tagline
+        x_pos = centered_x(c, tagline, logo_font)
+        draw_text(img_rgba, (x_pos, c.y(960)), tagline, DARK_NAVY, logo_font)
+
+    return SlideLayers(c, background, text_layer)
+
+
+@profiled()
+def create_cta_slide_v2(headline_lines, body_lines, url_text, tagline, size=(WIDTH, HEIGHT), supersample=1):
+    """Enhanced CTA Slide"""
+    return _flatten(cta_slide_layers(headline_lines, body_lines, url_text, tagline, size, supersample))
+
+
+def og_card_layers(title_lines, description, url_text, size=OG_SIZE, supersample=1):
+    """Link-share card layers in the cover slide's style, laid out on a 1200x627 design"""
+    c = Canvas(size, supersample, design=OG_SIZE)
+
+    background = Background(DARK_NAVY, DARK_TEAL, [
+        (circuit_overlay, BRIGHT_CYAN, 40, CIRCUIT_SEED),
+        (neural_network_overlay, BRIGHT_CYAN, 60, NEURAL_SEED),
+    ])
+
+    def text_layer(img_rgba, draw):
+        text_width = c.units(c.width - 2 * c.x(80))
+        small_font = get_font(c.px(26))
+
+        # Title: one size for every line, as large as the widest line allows
+        title_size = min(fit_text(line, text_width, 80, 76, min_size=40, max_lines=1).size for line in title_lines)
+        title_font = get_font(c.px(title_size))
+        y_pos = c.y(90)
+        for line in title_lines:
+            x_pos = centered_x(c, line, title_font)
+            add_glow_text(img_rgba, line, (x_pos, y_pos), title_font, WHITE, BRIGHT_CYAN,
+                          radius=c.px(12), strength=0.8)
+            y_pos += c.px(title_size * 1.15)
+
+        # Decorative line
+        y_pos += c.px(24)
+        draw.line([(c.width//2 - c.px(100), y_pos), (c.width//2 + c.px(100), y_pos)],
+                  fill=BRIGHT_CYAN, width=c.px(3))
+
+        # Description, shrunk to stay clear of the footer
+        y_pos += c.px(36)
+        fitted = fit_text(description, text_width, c.units(c.y(520) - y_pos), 34, min_size=20,
+                          line_spacing=1.3, max_lines=3)
+        font = get_font(c.px(fitted.size))
+        for line in fitted.lines:
+            x_pos = centered_x(c, line, font)
+            draw_text(img_rgba, (x_pos, y_pos), line, WHITE, font)
+            y_pos += c.px(fitted.line_height)
+
+        # Footer: logo left, page URL right
+        draw_logo(img_rgba, draw, (c.x(80), c.y(560)), LOGO_TEXT, small_font, BRIGHT_CYAN, c.px(48))
+        url_width = ATLAS.bbox(small_font, url_text)[2]
+        draw_text(img_rgba, (c.right(80) - url_width, c.y(560)), url_text, BRIGHT_CYAN, small_font)
+
+    return SlideLayers(c, background, text_layer)
+
+
+@profiled()
+def create_og_card_v2(title_lines, description, url_text, size=OG_SIZE, supersample=1):
+    """Open Graph card for a site page"""
+    return _flatten(og_card_layers(title_lines, description, url_text, size, supersample))
+
+
+# Deck spec layout name -> slide builder
+LAYOUTS = {
+    'cover': create_slide_1_v2,
+    'sign': create_sign_slide_v2,
+    'solution': create_solution_slide_v2,
+    'cta': create_cta_slide_v2,
+    'og': create_og_card_v2,
+}
+
+# Deck spec layout name -> design-unit text layout, fitted once per slide and passed to
+# every size variant as text_layout
+TEXT_LAYOUTS = {
+    'sign': sign_text_layout,
+}
+
+# Deck spec layout name -> layer builder (same arguments), for animated exports
+LAYER_BUILDERS = {
+    'cover': slide_1_layers,
+    'sign': sign_slide_layers,
+    'solution': solution_slide_layers,
+    'cta': cta_slide_layers,
+    'og': og_card_layers,
+}
+
+
+def main(argv=None):
     """Generate all enhanced slides"""
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    parser = add_render_arguments(argparse.ArgumentParser(description=__doc__))
+    add_build_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
 
     print("🚀 Generating enhanced carousel slides with advanced tech elements...")
     print()
 
-    # Slide 1 - Cover
-    print("✨ Creating slide 1: Cover (with neural network pattern)")
-    slide1 = create_slide_1_v2()
-    slide1.save(f"{OUTPUT_DIR}/slide_01_cover.png", quality=95)
-
-    # Slide 2 - Sign #1
-    print("✨ Creating slide 2: Sign #1 (dark with geometric shapes)")
-    slide2 = create_sign_slide_v2(
-        1,
-        "You're Building Workarounds for Workarounds",
-        "Your team spends more time finding ways around your software's limitations than actually using it.",
-        style='dark'
-    )
-    slide2.save(f"{OUTPUT_DIR}/slide_02_sign1.png", quality=95)
-
-    # Slide 3 - Sign #2
-    print("✨ Creating slide 3: Sign #2 (light with circuit pattern)")
-    slide3 = create_sign_slide_v2(
-        2,
-        "You're Paying for 80% You Don't Use",
-        "Template platforms charge for every feature—even the ones that don't fit your workflow.",
-        style='light'
-    )
-    slide3.save(f"{OUTPUT_DIR}/slide_03_sign2.png", quality=95)
-
-    # Slide 4 - Sign #3
-    print("✨ Creating slide 4: Sign #3 (cyan gradient with AI pattern)")
-    slide4 = create_sign_slide_v2(
-        3,
-        "Custom Requests Get a 'No' or '$$$'",
-        "Every unique need hits a wall: 'Not possible' or expensive custom development on top of your subscription.",
-        style='cyan'
-    )
-    slide4.save(f"{OUTPUT_DIR}/slide_04_sign3.png", quality=95)
-
-    # Slide 5 - Sign #4
-    print("✨ Creating slide 5: Sign #4 (light with tech elements)")
-    slide5 = create_sign_slide_v2(
-        4,
-        "Integration Hell",
-        "Your Google Workspace, CRM, and website don't talk to each other—so you're copying data manually.",
-        style='light'
-    )
-    slide5.save(f"{OUTPUT_DIR}/slide_05_sign4.png", quality=95)
-
-    # Slide 6 - Sign #5
-    print("✨ Creating slide 6: Sign #5 (dark gradient)")
-    slide6 = create_sign_slide_v2(
-        5,
-        "Scaling Means Starting Over",
-        "Your template solution can't grow with you. Hitting a growth wall means rebuilding from scratch.",
-        style='dark'
-    )
-    slide6.save(f"{OUTPUT_DIR}/slide_06_sign5.png", quality=95)
-
-    # Slide 7 - Solution
-    print("✨ Creating slide 7: Solution (with full tech overlay)")
-    slide7 = create_solution_slide_v2()
-    slide7.save(f"{OUTPUT_DIR}/slide_07_solution.png", quality=95)
-
-    # Slide 8 - CTA
-    print("✨ Creating slide 8: Call to Action (bright with geometric shapes)")
-    slide8 = create_cta_slide_v2()
-    slide8.save(f"{OUTPUT_DIR}/slide_08_cta.png", quality=95)
+    jobs = deck_jobs(load_deck(DECK_SPEC), LAYOUTS, OUTPUT_DIR)
+
+    workers, force = args.workers, args.force
+    if args.profile:
+        # Stages are recorded in this process, and every slide must actually render
+        workers = workers if args.threads else 1
+        force = True
+        # Cached layers and region repaints would hide the stages that build and compose slides
+        saved = LAYER_CACHE.max_items, LAYER_CACHE.cache_dir, REGION_CACHE.max_bytes
+        LAYER_CACHE.max_items, LAYER_CACHE.cache_dir, REGION_CACHE.max_bytes = 0, None, 0
+        LAYER_CACHE.clear()
+        REGION_CACHE.clear()
+        PROFILER.start()
+
+    start = time.perf_counter()
+    try:
+        build_slides(jobs, workers=workers, executor='thread' if args.threads else 'process',
+                     encoding=args.format, force=force)
+    finally:
+        if args.profile:
+            PROFILER.stop()
+            LAYER_CACHE.max_items, LAYER_CACHE.cache_dir, REGION_CACHE.max_bytes = saved
+    elapsed = time.perf_counter() - start
+
+    if args.profile:
+        print()
+        print(PROFILER.summary())
+        print(f"📈 Trace written to {PROFILER.write_trace(args.profile)} (open in ui.perfetto.dev)")
 
     print()
-    print("✅ All enhanced slides generated successfully!")
+    print(f"✅ All enhanced slides generated successfully in {elapsed:.2f}s!")
     print(f"📁 Saved to: {os.path.abspath(OUTPUT_DIR)}")
     print()
     print("🎨 Features added:")
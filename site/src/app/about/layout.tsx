@@ -0,0 +1,32 @@
+import type { Metadata } from "next";
+
+const title = "About | SageMind AI";
+const description = "At SageMind, we believe every business deserves solutions crafted specifically for their unique needs. We combine speed with customization to deliver results that matter.";
+
+export const metadata: Metadata = {
+  title,
+  description,
+  openGraph: {
+    title,
+    description,
+    url: "https://sagemindai.io/about",
+    siteName: "SageMind AI",
+    locale: "en_US",
+    type: "website",
+    images: [{ url: "/og/about.png", width: 1200, height: 627 }],
+  },
+  twitter: {
+    card: "summary_large_image",
+    title,
+    description,
+    images: ["/og/about.png"],
+  },
+};
+
+export default function AboutLayout({
+  children,
+}: Readonly<{
+  children: React.ReactNode;
+}>) {
+  return children;
+}
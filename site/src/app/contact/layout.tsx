@@ -0,0 +1,32 @@
+import type { Metadata } from "next";
+
+const title = "Contact | SageMind AI";
+const description = "Tell us about your project and we'll craft a custom solution built just for you. We'd love to hear about your challenges and goals.";
+
+export const metadata: Metadata = {
+  title,
+  description,
+  openGraph: {
+    title,
+    description,
+    url: "https://sagemindai.io/contact",
+    siteName: "SageMind AI",
+    locale: "en_US",
+    type: "website",
+    images: [{ url: "/og/contact.png", width: 1200, height: 627 }],
+  },
+  twitter: {
+    card: "summary_large_image",
+    title,
+    description,
+    images: ["/og/contact.png"],
+  },
+};
+
+export default function ContactLayout({
+  children,
+}: Readonly<{
+  children: React.ReactNode;
+}>) {
+  return children;
+}
@@ -0,0 +1,32 @@
+import type { Metadata } from "next";
+
+const title = "Frequently Asked Questions | SageMind AI";
+const description = "Everything you need to know about working with SageMind. Can't find what you're looking for? Get in touch.";
+
+export const metadata: Metadata = {
+  title,
+  description,
+  openGraph: {
+    title,
+    description,
+    url: "https://sagemindai.io/faq",
+    siteName: "SageMind AI",
+    locale: "en_US",
+    type: "website",
+    images: [{ url: "/og/faq.png", width: 1200, height: 627 }],
+  },
+  twitter: {
+    card: "summary_large_image",
+    title,
+    description,
+    images: ["/og/faq.png"],
+  },
+};
+
+export default function FAQLayout({
+  children,
+}: Readonly<{
+  children: React.ReactNode;
+}>) {
+  return children;
+}
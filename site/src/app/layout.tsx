@@ -29,11 +29,13 @@ export const metadata: Metadata = {
     siteName: "SageMind AI",
     locale: "en_US",
     type: "website",
+    images: [{ url: "/og/home.png", width: 1200, height: 627 }],
   },
   twitter: {
     card: "summary_large_image",
     title: "SageMind AI | Custom Solutions, Built for You",
     description: "Custom websites, Google Workspace solutions, and custom AI applications. We craft tailored solutions that fit your unique business needs.",
+    images: ["/og/home.png"],
   },
 };
 
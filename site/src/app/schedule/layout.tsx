@@ -0,0 +1,32 @@
+import type { Metadata } from "next";
+
+const title = "Book a 30-Minute Call | SageMind AI";
+const description = "Let's discuss your project, challenges, and how we can help. No obligations, just a conversation.";
+
+export const metadata: Metadata = {
+  title,
+  description,
+  openGraph: {
+    title,
+    description,
+    url: "https://sagemindai.io/schedule",
+    siteName: "SageMind AI",
+    locale: "en_US",
+    type: "website",
+    images: [{ url: "/og/schedule.png", width: 1200, height: 627 }],
+  },
+  twitter: {
+    card: "summary_large_image",
+    title,
+    description,
+    images: ["/og/schedule.png"],
+  },
+};
+
+export default function ScheduleLayout({
+  children,
+}: Readonly<{
+  children: React.ReactNode;
+}>) {
+  return children;
+}
@@ -0,0 +1,32 @@
+import type { Metadata } from "next";
+
+const title = "Services | SageMind AI";
+const description = "We offer two specialized service tracks, each designed to meet specific business needs. Every solution is custom-built for your unique situation.";
+
+export const metadata: Metadata = {
+  title,
+  description,
+  openGraph: {
+    title,
+    description,
+    url: "https://sagemindai.io/services",
+    siteName: "SageMind AI",
+    locale: "en_US",
+    type: "website",
+    images: [{ url: "/og/services.png", width: 1200, height: 627 }],
+  },
+  twitter: {
+    card: "summary_large_image",
+    title,
+    description,
+    images: ["/og/services.png"],
+  },
+};
+
+export default function ServicesLayout({
+  children,
+}: Readonly<{
+  children: React.ReactNode;
+}>) {
+  return children;
+}